@@ -0,0 +1,248 @@
+"""
+Sparse time index for the daily CSV files
+
+Next to each data/readings_YYYY-MM-DD.csv the logger keeps
+data/readings_YYYY-MM-DD.idx, one "timestamp,byte_offset" line every
+INDEX_EVERY_ROWS rows or INDEX_EVERY_SECONDS seconds, whichever comes
+first. Rows are appended in time order, so a binary search over the index
+gives a byte offset at most one interval before any timestamp; readers seek
+there and scan a handful of rows instead of parsing the whole day.
+
+- note_row(): logger side, called after each row is appended
+- seek(): reader side, validates the index and rebuilds it lazily if it is
+  missing or stale (rows written without it, file replaced). Readers only
+  read the bytes appended to the sidecar since their last visit.
+
+The logger is the only writer of today's sidecar: a reader that has to
+rebuild it keeps the result in memory, since replacing the file would drop
+entries the logger appends meanwhile. Past days' sidecars are rewritten.
+
+No third-party imports: this module is shared by the logger scripts and
+the web app.
+"""
+
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Optional
+
+INDEX_EVERY_ROWS = 256
+# Several sample periods (the loggers sample every 300 s): ~24 entries a day
+INDEX_EVERY_SECONDS = 3600
+# Tail not covered by the index that readers tolerate before re-scanning it
+STALE_BYTES = 16 * 1024
+
+Entry = tuple[str, int]
+
+# Logger side: csv path -> [last indexed timestamp, rows since then]
+_writer_state: dict[str, list] = {}
+
+
+def index_path_for(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".idx"
+
+
+def _seconds(timestamp: str) -> int:
+    # "YYYY-MM-DD HH:MM:SS"; entries never span days
+    return int(timestamp[11:13]) * 3600 + int(timestamp[14:16]) * 60 + int(timestamp[17:19])
+
+
+def _due(state: list, timestamp: str) -> bool:
+    last_ts, rows_since = state
+    if last_ts is None or rows_since >= INDEX_EVERY_ROWS:
+        return True
+    return _seconds(timestamp) - _seconds(last_ts) >= INDEX_EVERY_SECONDS
+
+
+def _read_entries(idx_path: str, pos: int = 0) -> tuple[list[Entry], int]:
+    """Entries from complete lines at/after byte `pos`; return (entries, end)."""
+    entries: list[Entry] = []
+    try:
+        with open(idx_path, "rb") as f:
+            f.seek(pos)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # entry still being written
+                pos += len(raw)
+                ts, _, offset = raw.decode(errors="replace").strip().rpartition(",")
+                if ts and offset.isdigit():
+                    entries.append((ts, int(offset)))
+    except OSError:
+        pass
+    return entries, pos
+
+
+def read_index(idx_path: str) -> list[Entry]:
+    return _read_entries(idx_path)[0]
+
+
+def note_row(csv_path: str, timestamp: str, offset: int) -> None:
+    """Logger hook: a row stamped `timestamp` was appended at byte `offset`."""
+    state = _writer_state.get(csv_path)
+    if state is None:
+        # Fresh process (or new day): continue from what is on disk
+        entries = read_index(index_path_for(csv_path))
+        state = [entries[-1][0], 0] if entries else [None, 0]
+        _writer_state.clear()  # only today's file is ever written
+        _writer_state[csv_path] = state
+
+    if not _due(state, timestamp):
+        state[1] += 1
+        return
+
+    try:
+        with open(index_path_for(csv_path), "a") as f:
+            f.write(f"{timestamp},{offset}\n")
+    except OSError:
+        return  # the index is an optimisation; readers rebuild it if needed
+    state[0], state[1] = timestamp, 0
+
+
+def _scan(csv_path: str, pos: int, state: list) -> tuple[list[Entry], int]:
+    """Index complete rows from `pos`; return (new entries, end offset)."""
+    entries: list[Entry] = []
+    with open(csv_path, "rb") as f:
+        if pos == 0:
+            pos = len(f.readline())
+        f.seek(pos)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            timestamp = raw[:19].decode(errors="replace")
+            if len(timestamp) == 19 and timestamp[4] == "-":
+                if _due(state, timestamp):
+                    entries.append((timestamp, pos))
+                    state[0], state[1] = timestamp, 0
+                else:
+                    state[1] += 1
+            pos += len(raw)
+    return entries, pos
+
+
+def _valid(csv_path: str, entries: list[Entry], size: int) -> bool:
+    ts, offset = entries[-1]
+    if offset >= size:
+        return False
+    with open(csv_path, "rb") as f:
+        f.seek(offset)
+        return f.read(len(ts)).decode(errors="replace") == ts
+
+
+def _write_index(csv_path: str, entries: list[Entry]) -> None:
+    idx_path = index_path_for(csv_path)
+    tmp_path = idx_path + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.writelines(f"{ts},{offset}\n" for ts, offset in entries)
+        os.replace(tmp_path, idx_path)
+    except OSError:
+        pass
+
+
+def _being_written(csv_path: str) -> bool:
+    # readings_YYYY-MM-DD.csv: only today's file gets appended to
+    return os.path.basename(csv_path).endswith(time.strftime("%Y-%m-%d") + ".csv")
+
+
+def _identity(path: str) -> Optional[tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino, st.st_size
+
+
+class _Cached:
+    """Reader state for one CSV file."""
+
+    def __init__(self, ident: tuple[int, int]) -> None:
+        self.ident = ident
+        self.entries: list[Entry] = []
+        self.covered = 0  # CSV offset the entries account for
+        self.state: list = [None, 0]  # _due() state at `covered`
+        # Sidecar the entries were read from (None: built in memory)
+        self.idx_ident: Optional[tuple[int, int]] = None
+        self.idx_read = 0
+
+    def add(self, entries: list[Entry]) -> None:
+        # Keep entries strictly ordered; drop any the tail scan already made
+        last = self.entries[-1][1] if self.entries else -1
+        new = [entry for entry in entries if entry[1] > last]
+        if new:
+            self.entries = self.entries + new
+            if new[-1][1] >= self.covered:
+                # Resume just before the last indexed row (-1: that row is
+                # re-read by _scan and must not count towards the next)
+                self.covered, self.state = new[-1][1], [new[-1][0], -1]
+
+
+# Reader side: csv path -> _Cached
+_reader_cache: dict[str, _Cached] = {}
+_reader_lock = threading.Lock()
+
+
+def _load(csv_path: str, ident: tuple[int, int], size: int) -> _Cached:
+    """Fresh reader state: the sidecar if valid, else a rebuild."""
+    cached = _Cached(ident)
+    idx_path = index_path_for(csv_path)
+    idx = _identity(idx_path)
+    entries, idx_read = _read_entries(idx_path)
+    if idx and entries and _valid(csv_path, entries, size):
+        cached.add(entries)
+        cached.idx_ident, cached.idx_read = idx[:2], idx_read
+        return cached
+
+    entries, cached.covered = _scan(csv_path, 0, cached.state)
+    cached.entries = entries
+    if not _being_written(csv_path):
+        _write_index(csv_path, entries)
+        idx = _identity(idx_path)
+        if idx:
+            cached.idx_ident, cached.idx_read = idx[:2], idx[2]
+    return cached
+
+
+def load_index(csv_path: str) -> list[Entry]:
+    """Entries for `csv_path`, rebuilding the sidecar if missing or stale."""
+    with _reader_lock:
+        csv_st = _identity(csv_path)
+        if csv_st is None:
+            _reader_cache.pop(csv_path, None)
+            return []
+        ident, size = csv_st[:2], csv_st[2]
+
+        cached = _reader_cache.get(csv_path)
+        if cached is None or cached.ident != ident or size < cached.covered:
+            cached = _load(csv_path, ident, size)
+        elif cached.idx_ident is not None:
+            idx = _identity(index_path_for(csv_path))
+            if idx is None or idx[:2] != cached.idx_ident or idx[2] < cached.idx_read:
+                cached = _load(csv_path, ident, size)
+            elif idx[2] > cached.idx_read:
+                # Only the entries the logger appended since the last visit
+                entries, cached.idx_read = _read_entries(index_path_for(csv_path), cached.idx_read)
+                cached.add(entries)
+
+        # A long tail the sidecar doesn't cover (rows written by a logger
+        # without the index): index it in memory only
+        if size - cached.covered > STALE_BYTES:
+            new, cached.covered = _scan(csv_path, cached.covered, cached.state)
+            cached.entries = cached.entries + new
+
+        _reader_cache[csv_path] = cached
+        return cached.entries
+
+
+def seek(csv_path: str, timestamp: str, strict: bool = False) -> int:
+    """
+    Byte offset to start scanning from for rows at/after `timestamp`
+    (strictly after it with `strict`). 0 means "from the header".
+    """
+    entries = load_index(csv_path)
+    if strict:
+        i = bisect_right(entries, (timestamp, sys.maxsize)) - 1
+    else:
+        i = bisect_left(entries, (timestamp, -1)) - 1
+    return entries[i][1] if i >= 0 else 0
@@ -0,0 +1,213 @@
+"""
+Background LCD pipeline for the I2C 1602 display
+
+- LCDWorker owns the LCD; the sampling loop only posts state to it
+- Latest-value mailbox: posting never blocks, newer state replaces older
+- Frames are diffed against what is already on the glass, and only the
+  changed character cells are sent over I2C
+- FakeCharLCD mimics the RPLCD CharLCD calls we use and counts traffic,
+  so the pipeline can be exercised without hardware
+"""
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+LCD_COLS = 16
+LCD_ROWS = 2
+
+Frame = tuple[str, ...]
+Renderer = Callable[[dict[str, Any], float], Frame]
+
+
+def fit_line(text: str, cols: int = LCD_COLS) -> str:
+    """Force exactly `cols` chars for a clean display."""
+    return (text[:cols]).ljust(cols)
+
+
+def changed_runs(old: str, new: str, max_gap: int = 1) -> list[tuple[int, int]]:
+    """
+    Return (start, end) column spans where `new` differs from `old`.
+
+    Spans separated by `max_gap` unchanged cells or fewer are merged:
+    rewriting one unchanged char costs the same as a cursor move.
+    """
+    runs: list[tuple[int, int]] = []
+    col = 0
+    while col < len(new):
+        if col < len(old) and old[col] == new[col]:
+            col += 1
+            continue
+        start = col
+        while col < len(new) and not (col < len(old) and old[col] == new[col]):
+            col += 1
+        if runs and start - runs[-1][1] <= max_gap:
+            runs[-1] = (runs[-1][0], col)
+        else:
+            runs.append((start, col))
+    return runs
+
+
+class LCDWorker:
+    """
+    Owns an LCD on a background thread.
+
+    post() stores the latest state and returns immediately. The worker wakes
+    on every post and every `tick_seconds` (for the live clock / page
+    rotation), renders a frame with `render(state, now)` and writes only
+    the cells that differ from the previous frame.
+
+    Pass `connect` instead of `lcd` to open the display on the worker thread,
+    keeping I2C initialisation off the caller's startup path; a failed
+    connect is retried on the next tick.
+    """
+
+    def __init__(
+        self,
+        lcd: Any,
+        render: Renderer,
+        tick_seconds: float = 1.0,
+        cols: int = LCD_COLS,
+        rows: int = LCD_ROWS,
+        connect: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.lcd = lcd
+        self.connect = connect
+        self.render = render
+        self.tick_seconds = tick_seconds
+        self.cols = cols
+        self.rows = rows
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._state: dict[str, Any] = {}
+        self._stopping = False
+
+        # What we believe is on the glass; None forces a full redraw
+        self._shown: Optional[list[str]] = None
+        self._cursor: Optional[tuple[int, int]] = None
+
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="lcd-worker", daemon=True)
+
+    def start(self) -> "LCDWorker":
+        self._thread.start()
+        return self
+
+    def post(self, **state: Any) -> None:
+        """Replace the pending state (latest value wins). Never touches I2C."""
+        with self._lock:
+            self._state = state
+        self._wake.set()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Draw the last posted state, then stop the worker thread."""
+        with self._lock:
+            self._stopping = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.tick_seconds)
+            self._wake.clear()
+
+            with self._lock:
+                state = self._state
+                stopping = self._stopping
+
+            if state:
+                try:
+                    if self.lcd is None and self.connect is not None:
+                        self.lcd = self.connect()
+                    self.draw(self.render(state, time.time()))
+                except Exception:
+                    # I2C glitches must never kill the display thread;
+                    # forget what's shown so the next frame is a full redraw.
+                    self.errors += 1
+                    self._shown = None
+                    self._cursor = None
+
+            if stopping:
+                return
+
+    def draw(self, frame: Frame) -> None:
+        """Write `frame` to the LCD, sending only changed cells."""
+        lines = [fit_line(frame[r] if r < len(frame) else "", self.cols) for r in range(self.rows)]
+        old = self._shown or [""] * self.rows
+
+        for row, line in enumerate(lines):
+            for start, end in changed_runs(old[row], line):
+                if self._cursor != (row, start):
+                    self.lcd.cursor_pos = (row, start)
+                self.lcd.write_string(line[start:end])
+                # HD44780 auto-advances; past the last column RPLCD wraps
+                self._cursor = (row, end) if end < self.cols else None
+
+        self._shown = lines
+
+
+class FakeCharLCD:
+    """
+    Stand-in for RPLCD.i2c.CharLCD that records I2C traffic.
+
+    Every command (cursor move, clear, home) and every character written is
+    one HD44780 byte on the bus; `bytes_sent` is their total.
+    """
+
+    def __init__(self, cols: int = LCD_COLS, rows: int = LCD_ROWS, fail_writes: int = 0) -> None:
+        self.cols = cols
+        self.rows = rows
+        self.buffer = [[" "] * cols for _ in range(rows)]
+        self._pos = (0, 0)
+
+        self.commands = 0
+        self.chars = 0
+        self.fail_writes = fail_writes
+
+    @property
+    def bytes_sent(self) -> int:
+        return self.commands + self.chars
+
+    def reset_counts(self) -> None:
+        self.commands = 0
+        self.chars = 0
+
+    @property
+    def cursor_pos(self) -> tuple[int, int]:
+        return self._pos
+
+    @cursor_pos.setter
+    def cursor_pos(self, pos: tuple[int, int]) -> None:
+        self.commands += 1
+        self._pos = pos
+
+    def home(self) -> None:
+        self.commands += 1
+        self._pos = (0, 0)
+
+    def clear(self) -> None:
+        self.commands += 1
+        self.buffer = [[" "] * self.cols for _ in range(self.rows)]
+        self._pos = (0, 0)
+
+    def write_string(self, text: str) -> None:
+        if self.fail_writes > 0:
+            self.fail_writes -= 1
+            raise OSError("simulated I2C error")
+
+        row, col = self._pos
+        for ch in text:
+            self.chars += 1
+            self.buffer[row][col] = ch
+            col += 1
+            if col >= self.cols:
+                row, col = (row + 1) % self.rows, 0
+        self._pos = (row, col)
+
+    def close(self, clear: bool = False) -> None:
+        if clear:
+            self.clear()
+
+    def lines(self) -> list[str]:
+        return ["".join(r) for r in self.buffer]
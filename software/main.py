@@ -5,18 +5,28 @@ Environmental Monitoring Application
 - Photoresistor divider (light/dark) on GPIO17
 
 Reads Temp/Humidity and light state and prints status lines .
+
+Hardware libraries are imported lazily (on first use), so importing this
+module for its CSV helpers does not load them; main() pays for them before
+the first sample. Under a systemd Type=notify unit the logger reports
+READY=1 once the first sample has been taken.
 """
 
+from startup import lazy_import, notify_ready
+
 import time
-import board
-import adafruit_dht
-import RPi.GPIO as GPIO
 from datetime import datetime
 import csv
 import os
 
+import csv_index
+
+board = lazy_import("board")
+adafruit_dht = lazy_import("adafruit_dht")
+GPIO = lazy_import("RPi.GPIO")
+
 # --- Pins (BCM numbering) ---
-DHT_PIN = board.D4     # GPIO4
+DHT_PIN_NAME = "D4"    # GPIO4 (board.D4, resolved at startup)
 LIGHT_PIN = 17         # GPIO17
 
 # --- CSV File Path ---
@@ -55,7 +65,8 @@ def main() -> None:
     os.makedirs(DATA_DIR, exist_ok=True)
 
 
-    dht = adafruit_dht.DHT11(DHT_PIN)
+    dht = adafruit_dht.DHT11(getattr(board, DHT_PIN_NAME))
+    ready = False
 
     try:
         while True:
@@ -76,12 +87,19 @@ def main() -> None:
 
                 with open(log_path, mode="a", newline="") as file:
                     writer = csv.writer(file)
+                    row_offset = file.tell()
                     writer.writerow([timestamp, f"{temp_f:.1f}", humidity, light_state])
+                csv_index.note_row(log_path, timestamp, row_offset)
 
             except RuntimeError as err:
                 # DHT sensors commonly fail reads; keep running.
                 print(f"{timestamp} DHT read error: {err} | {light_state}")
 
+            if not ready:
+                elapsed = notify_ready("Sampling")
+                print(f"Ready in {elapsed:.2f}s")
+                ready = True
+
             time.sleep(300)
 
     except KeyboardInterrupt:
@@ -4,30 +4,48 @@ Environmental Monitor (5-minute sampling) + I2C 1602 LCD
 - Reads DHT11 (temp/humidity) + photoresistor (LIGHT/DARK)
 - Logs to CSV
 - Displays latest values on an I2C 1602 LCD
+
+The LCD is driven by a background worker (see lcd_display.py): the sampling
+loop only posts the latest state, so I2C traffic never delays sensor reads
+or CSV writes. The display refreshes every second with a live clock and
+rotates through readings, today's min/max and sensor status pages.
+
+Hardware libraries are imported lazily (main() still loads the sensor ones
+before the first sample) and the LCD is initialised on the worker thread, so
+a restart does not wait on I2C. Under a systemd Type=notify unit the logger
+reports READY=1 after the first sample.
 """
 
+from startup import lazy_import, notify_ready
+
 import csv
 import time
 from datetime import datetime
 import os
-import board
-import adafruit_dht
-import RPi.GPIO as GPIO
+from typing import Optional
+
+import csv_index
+from lcd_display import LCDWorker
 
-from RPLCD.i2c import CharLCD
+board = lazy_import("board")
+adafruit_dht = lazy_import("adafruit_dht")
+GPIO = lazy_import("RPi.GPIO")
+rplcd_i2c = lazy_import("RPLCD.i2c")
 
 
 # --- Config ---
 SAMPLE_SECONDS = 300  # 5 minutes
 DATA_DIR = "data"
 
-DHT_PIN = board.D4     # GPIO4
+DHT_PIN_NAME = "D4"    # GPIO4 (board.D4, resolved at startup)
 LIGHT_PIN = 17         # GPIO17
 
 # LCD config (most common: 0x27, sometimes 0x3f)
 LCD_ADDRESS = 0x27
 LCD_COLS = 16
 LCD_ROWS = 2
+LCD_TICK_SECONDS = 1.0   # live clock refresh
+LCD_PAGE_SECONDS = 4     # time on each rotating page
 
 
 def c_to_f(celsius: float) -> float:
@@ -56,14 +74,66 @@ def ensure_csv_header(path: str) -> None:
             writer.writerow(["timestamp", "temp_f", "humidity", "light"])
 
 
-def lcd_write(lcd: CharLCD, line1: str, line2: str) -> None:
-    # Force exactly 16 chars per line for a clean display
-    line1 = (line1[:LCD_COLS]).ljust(LCD_COLS)
-    line2 = (line2[:LCD_COLS]).ljust(LCD_COLS)
-    lcd.home()
-    lcd.write_string(line1)
-    lcd.cursor_pos = (1, 0)
-    lcd.write_string(line2)
+def open_lcd():
+    """Connect to the I2C LCD (runs on the LCD worker thread)."""
+    lcd = rplcd_i2c.CharLCD("PCF8574", LCD_ADDRESS, port=1, cols=LCD_COLS, rows=LCD_ROWS)
+    lcd.clear()
+    return lcd
+
+
+def update_stats(stats: dict, timestamp: str, temp_f: Optional[float] = None, humidity: Optional[float] = None) -> None:
+    """Track today's min/max and counts for the LCD stats pages (None = failed read)."""
+    date_str = timestamp[:10]
+    if stats.get("date") != date_str:
+        stats.clear()
+        stats.update(date=date_str, ok=0, errors=0)
+    if temp_f is None or humidity is None:
+        stats["errors"] += 1
+        return
+    stats["ok"] += 1
+    stats["last_ok"] = timestamp
+    stats["t_min"] = min(stats.get("t_min", temp_f), temp_f)
+    stats["t_max"] = max(stats.get("t_max", temp_f), temp_f)
+    stats["h_min"] = min(stats.get("h_min", humidity), humidity)
+    stats["h_max"] = max(stats.get("h_max", humidity), humidity)
+
+
+def render_lcd(state: dict, now: float) -> tuple[str, str]:
+    """Build the 2-line frame for the current state and wall-clock time."""
+    if "message" in state:
+        return state["message"]
+
+    clock = time.strftime("%H:%M:%S", time.localtime(now))
+    light_state = state.get("light", "")
+    stats = state.get("stats", {})
+
+    pages = ["reading"]
+    if "t_min" in stats:
+        pages.append("minmax")
+    pages.append("status")
+    page = pages[int(now // LCD_PAGE_SECONDS) % len(pages)]
+
+    if page == "minmax":
+        return (
+            f"T {stats['t_min']:.1f}-{stats['t_max']:.1f}F",
+            f"H {stats['h_min']:.0f}-{stats['h_max']:.0f}%  {clock[:5]}",
+        )
+
+    if page == "status":
+        last_ok = stats.get("last_ok", "--:--:--")[-8:]
+        return (
+            f"OK:{stats.get('ok', 0)} ERR:{stats.get('errors', 0)}",
+            f"Last {last_ok}",
+        )
+
+    if state.get("error"):
+        return ("DHT READ ERROR", f"{light_state} {clock}")
+    if state.get("temp_f") is None:
+        return ("Waiting for DHT", f"{light_state} {clock}")
+    return (
+        f"T:{state['temp_f']:>4.1f}F H:{state['humidity']:>2.0f}%",
+        f"{light_state} {clock}",
+    )
 
 
 def main() -> None:
@@ -71,12 +141,15 @@ def main() -> None:
 
     setup_gpio()
 
-    dht = adafruit_dht.DHT11(DHT_PIN)
+    # LCD is opened on the worker thread; only that thread talks to it
+    display = LCDWorker(None, render_lcd, tick_seconds=LCD_TICK_SECONDS, cols=LCD_COLS, rows=LCD_ROWS, connect=open_lcd)
+    display.start()
+    display.post(message=("Env Monitor", "Starting..."))
 
-    # Init LCD
-    lcd = CharLCD("PCF8574", LCD_ADDRESS, port=1, cols=LCD_COLS, rows=LCD_ROWS)
-    lcd.clear()
-    lcd_write(lcd, "Env Monitor", "Starting...")
+    dht = adafruit_dht.DHT11(getattr(board, DHT_PIN_NAME))
+
+    stats: dict = {}
+    ready = False
 
     next_run = time.monotonic()
 
@@ -109,26 +182,33 @@ def main() -> None:
                 # CSV
                 with open(log_path, mode="a", newline="") as f:
                     writer = csv.writer(f)
+                    row_offset = f.tell()
                     writer.writerow([timestamp, f"{temp_f:.1f}", f"{humidity:.0f}", light_state])
+                csv_index.note_row(log_path, timestamp, row_offset)
 
-                # LCD (2 lines, compact)
-                lcd_line1 = f"T:{temp_f:>4.1f}F H:{humidity:>2.0f}%"
-                lcd_line2 = f"{light_state} {timestamp[-8:]}"  # HH:MM:SS
-                lcd_write(lcd, lcd_line1, lcd_line2)
+                # LCD (non-blocking; the worker draws it)
+                update_stats(stats, timestamp, temp_f, humidity)
+                display.post(temp_f=temp_f, humidity=humidity, light=light_state, stats=stats.copy())
 
             except RuntimeError as err:
                 print(f"{timestamp} DHT read error: {err} | {light_state}")
-                lcd_write(lcd, "DHT READ ERROR", light_state)
+                update_stats(stats, timestamp)
+                display.post(error=str(err), light=light_state, stats=stats.copy())
+
+            if not ready:
+                elapsed = notify_ready("Sampling")
+                print(f"Ready in {elapsed:.2f}s")
+                ready = True
 
     except KeyboardInterrupt:
         print("\nStopping Environmental Monitor...")
 
     finally:
         try:
-            lcd.clear()
-            lcd_write(lcd, "Monitor Stopped", "Goodbye")
+            display.post(message=("Monitor Stopped", "Goodbye"))
             time.sleep(1)
-            lcd.clear()
+            display.post(message=("", ""))
+            display.stop()
         except Exception:
             pass
 
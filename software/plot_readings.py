@@ -12,14 +12,17 @@ Style:
 - Humidity line = blue
 - Title shows Month + Year
 - X-axis shows only HH:MM:SS
+
+matplotlib is imported only when a plot is actually rendered, and only the
+object-oriented Figure API is used (no pyplot), so the web app can import
+this module and call plot_day() in-process without paying for matplotlib at
+startup.
 """
 
 import csv
 import os
 from datetime import datetime
 import sys
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 
 
 DATA_DIR = "data"
@@ -38,22 +41,8 @@ def output_path_for(date_str: str) -> str:
     return os.path.join(DATA_DIR, f"plot_{date_str}.png")
 
 
-def main() -> None:
-    date_str = sys.argv[1] if len(sys.argv) > 1 else today_str()
-    try:
-        datetime.strptime(date_str, "%Y-%m-%d")
-    except ValueError:
-        print("Usage: python software/plot_readings.py [YYYY-MM-DD]")
-        return
-
-    csv_path = csv_path_for(date_str)
-    output_path = output_path_for(date_str)
-
-    if not os.path.exists(csv_path):
-        print(f"Today's CSV not found: {csv_path}")
-        print("Run your monitor first to generate today's readings.")
-        return
-
+def load_readings(csv_path: str) -> tuple[list[datetime], list[float], list[float]]:
+    """Read (timestamps, temperatures, humidities) from a daily CSV."""
     timestamps: list[datetime] = []
     temperatures: list[float] = []
     humidities: list[float] = []
@@ -73,14 +62,35 @@ def main() -> None:
             temperatures.append(temp_f)
             humidities.append(hum)
 
+    return timestamps, temperatures, humidities
+
+
+def plot_day(date_str: str) -> str:
+    """
+    Render data/plot_<date>.png and return its path.
+
+    Raises FileNotFoundError if the day's CSV is missing and ValueError if it
+    has no data rows.
+    """
+    csv_path = csv_path_for(date_str)
+    output_path = output_path_for(date_str)
+
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(csv_path)
+
+    timestamps, temperatures, humidities = load_readings(csv_path)
     if not timestamps:
-        print(f"No data rows found in: {csv_path}")
-        return
+        raise ValueError(f"No data rows found in: {csv_path}")
+
+    # Deferred: matplotlib costs seconds to import on a Pi Zero
+    from matplotlib.figure import Figure
+    import matplotlib.dates as mdates
 
     month_year = timestamps[0].strftime("%B %Y")
 
     # --- Plot ---
-    fig, ax_temp = plt.subplots(figsize=(10, 5))
+    fig = Figure(figsize=(10, 5))
+    ax_temp = fig.add_subplot()
 
     # Temperature (left axis) - RED
     ax_temp.plot(timestamps, temperatures, color="red", linewidth=2, label="Temperature (°F)")
@@ -98,14 +108,35 @@ def main() -> None:
     ax_temp.set_xlabel("Time (HH:MM:SS)")
 
     # Title includes Month + Year
-    plt.title(f"Environmental Monitor — Temperature & Humidity ({month_year})")
+    ax_hum.set_title(f"Environmental Monitor — Temperature & Humidity ({month_year})")
 
     # Legends
     ax_temp.legend(loc="upper left")
     ax_hum.legend(loc="upper right")
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=200)
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=200)
+    return output_path
+
+
+def main() -> None:
+    date_str = sys.argv[1] if len(sys.argv) > 1 else today_str()
+    try:
+        datetime.strptime(date_str, "%Y-%m-%d")
+    except ValueError:
+        print("Usage: python software/plot_readings.py [YYYY-MM-DD]")
+        return
+
+    try:
+        output_path = plot_day(date_str)
+    except FileNotFoundError as err:
+        print(f"Today's CSV not found: {err}")
+        print("Run your monitor first to generate today's readings.")
+        return
+    except ValueError as err:
+        print(err)
+        return
+
     print(f"Saved plot to: {output_path}")
 
 
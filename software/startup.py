@@ -0,0 +1,70 @@
+"""
+Startup helpers shared by the logger scripts
+
+- lazy_import(): module proxy that defers the real import until first use,
+  so importing main.py / main_lcd.py for pure-data work (or for the startup
+  benchmark) never pulls in board / adafruit_dht / RPi.GPIO / RPLCD
+- sd_notify(): systemd readiness protocol (Type=notify) without the
+  python-systemd dependency
+"""
+
+import importlib
+import os
+import socket
+import time
+import types
+from typing import Any
+
+# Set as early as possible so "ready in X s" covers our own imports
+STARTED_AT = time.monotonic()
+
+
+class LazyModule(types.ModuleType):
+    """Placeholder module that imports the real one on first attribute access."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a lazy proxy for module `name` (e.g. "RPi.GPIO")."""
+    return LazyModule(name)
+
+
+def sd_notify(message: str) -> bool:
+    """
+    Send a status message (e.g. "READY=1") to systemd.
+
+    Returns False when not running under a Type=notify unit.
+    """
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address:
+        return False
+    if address.startswith("@"):
+        address = "\0" + address[1:]  # abstract namespace socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(message.encode())
+    except OSError:
+        return False
+    return True
+
+
+def notify_ready(status: str) -> float:
+    """Tell systemd we are sampling; return seconds since process start."""
+    elapsed = time.monotonic() - STARTED_AT
+    sd_notify(f"READY=1\nSTATUS={status} (ready in {elapsed:.2f}s)")
+    return elapsed
@@ -0,0 +1,107 @@
+"""
+Dashboard load test (stdlib only).
+
+What it does:
+- Opens N concurrent clients against a running web app
+- Each client polls like a dashboard tab: /api/latest, /api/today
+  (binary delta) and /api/logs
+- Reports p50 / p99 latency per endpoint and overall throughput
+- With --compare, runs the same load against a second server so two
+  builds (e.g. before / after a change) can be read side by side
+
+Run (server must already be up):
+  uvicorn web.app:app --port 8000
+  python tests/bench_load.py --url http://127.0.0.1:8000 --clients 200
+
+Before / after:
+  git worktree add /tmp/envmon-before <old-commit>
+  (cd /tmp/envmon-before && uvicorn web.app:app --port 8001)
+  python tests/bench_load.py --url http://127.0.0.1:8000 --compare http://127.0.0.1:8001
+"""
+
+import argparse
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+PATHS = {
+    "latest": ("/api/latest", "application/json"),
+    "today": ("/api/today?limit=5000", "application/x-envmon-columns"),
+    "logs": ("/api/logs?lines=80", "application/json"),
+}
+
+
+async def fetch(host: str, port: int, path: str, accept: str) -> tuple[int, float]:
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: {accept}\r\nConnection: close\r\n\r\n".encode()
+    )
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    status = int(data.split(b" ", 2)[1]) if data else 0
+    return status, time.perf_counter() - start
+
+
+async def client(host: str, port: int, rounds: int, results: dict[str, list[float]], errors: dict[str, int]) -> None:
+    for _ in range(rounds):
+        for name, (path, accept) in PATHS.items():
+            try:
+                status, elapsed = await fetch(host, port, path, accept)
+            except OSError:
+                errors[name] += 1
+                continue
+            if status >= 500 or status == 0:
+                errors[name] += 1
+            results[name].append(elapsed)
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(url: str, clients: int, rounds: int) -> dict:
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+
+    results: dict[str, list[float]] = {name: [] for name in PATHS}
+    errors = {name: 0 for name in PATHS}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, rounds, results, errors) for _ in range(clients)))
+    wall = time.perf_counter() - start
+
+    total = sum(len(v) for v in results.values())
+    summary = {"wall": wall, "rps": total / wall if wall else 0.0, "endpoints": {}}
+    for name, values in results.items():
+        if values:
+            summary["endpoints"][name] = (len(values), errors[name], percentile(values, 0.50), percentile(values, 0.99))
+        else:
+            summary["endpoints"][name] = (0, errors[name], float("nan"), float("nan"))
+    return summary
+
+
+def report(label: str, summary: dict) -> None:
+    print(f"\n[{label}] {summary['rps']:.0f} req/s over {summary['wall']:.1f}s")
+    print(f"{'endpoint':<10} {'ok':>6} {'err':>5} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, (count, errs, p50, p99) in summary["endpoints"].items():
+        print(f"{name:<10} {count:>6} {errs:>5} {p50 * 1000:>9.1f} {p99 * 1000:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent dashboard load test.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="server under test")
+    parser.add_argument("--compare", help="second server to run the same load against")
+    parser.add_argument("--clients", type=int, default=200, help="concurrent clients")
+    parser.add_argument("--rounds", type=int, default=5, help="polls per client")
+    args = parser.parse_args()
+
+    report(args.url, asyncio.run(run(args.url, args.clients, args.rounds)))
+    if args.compare:
+        report(args.compare, asyncio.run(run(args.compare, args.clients, args.rounds)))
+
+
+if __name__ == "__main__":
+    main()
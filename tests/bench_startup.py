@@ -0,0 +1,233 @@
+"""
+Startup benchmark (no hardware needed).
+
+What it does:
+- Imports the logger, LCD logger, plotter and web app in fresh interpreters
+  under `python -X importtime`
+- Reports cumulative import time, wall time, module count and whether any
+  hardware / plotting libraries were loaded at import time
+- Lists the heaviest imports for each target
+- Measures time to READY=1: runs each logger's main() in a fresh process
+  with a NOTIFY_SOCKET and times spawn -> READY=1 (deferred hardware
+  imports + setup + first sample). Off the Pi the hardware modules are
+  stubbed, so the real `board` / `adafruit_dht` / `RPi.GPIO` import cost is
+  reported separately when those libraries are installed
+
+Run from the repo root:
+  python tests/bench_startup.py
+  python tests/bench_startup.py --runs 5 --top 8
+  python tests/bench_startup.py --hardware   (on the Pi: real sensors)
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SOFTWARE_DIR = os.path.join(REPO_ROOT, "software")
+
+# label -> module to import
+TARGETS = {
+    "logger": "main",
+    "logger_lcd": "main_lcd",
+    "plotter": "plot_readings",
+    "web": "web.app",
+}
+
+# Modules that should never load just by importing the scripts
+HEAVY = ("board", "adafruit_dht", "RPi", "RPLCD", "matplotlib", "numpy")
+
+# label -> logger module whose main() reports READY=1
+READY_TARGETS = {
+    "logger": "main",
+    "logger_lcd": "main_lcd",
+}
+HARDWARE_IMPORTS = ("board", "adafruit_dht", "RPi.GPIO")
+READY_TIMEOUT_SECONDS = 30
+
+# Stand-ins for the hardware libraries when measuring off the Pi (RPLCD is
+# left out: the LCD worker retries in the background and never delays READY)
+STUBS = {
+    "board.py": "def __getattr__(name):\n    return name\n",
+    "adafruit_dht.py": (
+        "class DHT11:\n"
+        "    temperature = 21.5\n"
+        "    humidity = 40\n"
+        "    def __init__(self, pin):\n"
+        "        pass\n"
+        "    def exit(self):\n"
+        "        pass\n"
+    ),
+    os.path.join("RPi", "__init__.py"): "",
+    os.path.join("RPi", "GPIO.py"): (
+        "BCM = IN = 0\n"
+        "def setmode(mode): pass\n"
+        "def setup(pin, mode): pass\n"
+        "def input(pin): return 1\n"
+        "def cleanup(): pass\n"
+    ),
+}
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) rows from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(module: str) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([SOFTWARE_DIR, REPO_ROOT, env.get("PYTHONPATH", "")])
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+
+    rows = parse_importtime(proc.stderr)
+    total = next((cum for name, _, cum in rows if name == module), None)
+    error = None
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1]
+
+    loaded_heavy = sorted({name.split(".")[0] for name, _, _ in rows if name.split(".")[0] in HEAVY})
+    return {
+        "wall": wall,
+        "import_us": total,
+        "modules": len(rows),
+        "heavy": loaded_heavy,
+        "rows": rows,
+        "error": error,
+    }
+
+
+def write_stubs(directory: str) -> None:
+    for name, source in STUBS.items():
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(source)
+
+
+def measure_ready(module: str, stubbed: bool) -> dict:
+    """Spawn `module.main()` and time it until READY=1 arrives."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path_parts = [SOFTWARE_DIR, REPO_ROOT]
+        if stubbed:
+            stub_dir = os.path.join(tmp, "stubs")
+            write_stubs(stub_dir)
+            path_parts.insert(0, stub_dir)
+
+        notify_path = os.path.join(tmp, "notify.sock")
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(path_parts + [env.get("PYTHONPATH", "")])
+        env["NOTIFY_SOCKET"] = notify_path
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.bind(notify_path)
+            sock.settimeout(READY_TIMEOUT_SECONDS)
+
+            start = time.perf_counter()
+            # Data files go to the temporary directory, not the real data/
+            proc = subprocess.Popen(
+                [sys.executable, "-c", f"import {module}; {module}.main()"],
+                cwd=tmp,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            try:
+                message = sock.recv(4096).decode()
+                ready = time.perf_counter() - start
+            except socket.timeout:
+                message, ready = "", None
+            finally:
+                proc.kill()
+                _, stderr = proc.communicate()
+
+    status = next((line[len("STATUS="):] for line in message.splitlines() if line.startswith("STATUS=")), "")
+    error = None
+    if ready is None:
+        lines = stderr.strip().splitlines()
+        error = lines[-1] if lines else f"no READY=1 within {READY_TIMEOUT_SECONDS}s"
+    return {"ready": ready, "status": status, "error": error}
+
+
+def measure_hardware_imports() -> Optional[float]:
+    """Import time of the real hardware libraries, or None if not installed."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(HARDWARE_IMPORTS)],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return None
+    rows = parse_importtime(proc.stderr)
+    return sum(cum for name, _, cum in rows if name in HARDWARE_IMPORTS) / 1000
+
+
+def report_ready(runs: int, stubbed: bool) -> None:
+    kind = "stub hardware" if stubbed else "real hardware"
+    print(f"\ntime to READY=1 ({kind}; spawn -> first sample logged)")
+    for label, module in READY_TARGETS.items():
+        results = [measure_ready(module, stubbed) for _ in range(runs)]
+        ok = [r for r in results if r["ready"] is not None]
+        if not ok:
+            print(f"{label:<12} failed: {results[-1]['error']}")
+            continue
+        best = min(ok, key=lambda r: r["ready"])
+        print(f"{label:<12} {best['ready'] * 1000:>10.1f} ms  {best['status']}")
+
+    if stubbed:
+        hw_ms = measure_hardware_imports()
+        if hw_ms is None:
+            print("hardware imports: libraries not installed here; run with --hardware on the Pi")
+        else:
+            print(f"hardware imports: {hw_ms:.1f} ms on top of the stubbed times")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure import-time startup cost and time to READY=1.")
+    parser.add_argument("--runs", type=int, default=3, help="runs per target (best is reported)")
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list per target")
+    parser.add_argument("--hardware", action="store_true", help="use the real hardware libraries (on the Pi)")
+    args = parser.parse_args()
+
+    print(f"{'target':<12} {'import ms':>10} {'wall ms':>9} {'modules':>8}  heavy libs loaded")
+    for label, module in TARGETS.items():
+        results = [measure(module) for _ in range(args.runs)]
+        best = min(results, key=lambda r: r["wall"])
+
+        if best["error"]:
+            print(f"{label:<12} import failed: {best['error']}")
+            continue
+
+        import_ms = (best["import_us"] or 0) / 1000
+        heavy = ", ".join(best["heavy"]) or "none"
+        print(f"{label:<12} {import_ms:>10.1f} {best['wall'] * 1000:>9.1f} {best['modules']:>8}  {heavy}")
+
+        top = sorted(best["rows"], key=lambda r: r[1], reverse=True)[: args.top]
+        for name, self_us, _ in top:
+            print(f"{'':<14}{self_us / 1000:>8.1f} ms  {name}")
+
+    report_ready(args.runs, stubbed=not args.hardware)
+
+
+if __name__ == "__main__":
+    main()
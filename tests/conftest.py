@@ -0,0 +1,81 @@
+"""
+Shared setup for the no-hardware tests (pytest).
+
+- Puts the repo root on sys.path (`software` and `web` are namespace
+  packages imported as `from web import ...`) and skips the hardware scripts
+- data_dir: a temporary data/ directory wired into web/readings.py and
+  web/app.py, with fresh per-test caches; monkeypatch restores everything
+- write_day: appends readings to a day's CSV the way the logger does
+- client: a TestClient for the web app (needs httpx)
+"""
+
+import csv
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+HEADER = ["timestamp", "temp_f", "humidity", "light"]
+
+# Hardware bring-up scripts: run them directly on the Pi
+collect_ignore = ["test_dht11.py", "test_photoresistor.py", "test_all_sensors.py", "test_lcd1602.py"]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    from software import csv_index
+    from web import app as webapp
+    from web import columns, readings
+    from web.coalesce import SingleFlight
+
+    monkeypatch.setattr(readings, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(webapp, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(webapp, "COLUMN_CACHE", columns.ColumnCache())
+    monkeypatch.setattr(webapp, "SINGLE_FLIGHT", SingleFlight(ttl=0))
+    monkeypatch.setattr(csv_index, "_reader_cache", {})
+    monkeypatch.setattr(csv_index, "_writer_state", {})
+    return tmp_path
+
+
+@pytest.fixture
+def write_day(data_dir):
+    from software import csv_index
+    from web import readings
+
+    def write(date_str: str, clocks: list[str], values=None, index: bool = False) -> str:
+        """
+        Append one row per "HH:MM:SS" in `clocks` to the day's CSV, creating
+        it with its header first (csv.writer, CRLF, like the logger).
+        `values` gives (temp_f, humidity, light) per row; with `index` each
+        row is also passed to csv_index.note_row() as the logger does.
+        """
+        path = readings.csv_path_for(date_str)
+        if not os.path.exists(path):
+            with open(path, "w", newline="") as f:
+                csv.writer(f).writerow(HEADER)
+        with open(path, "a", newline="") as f:
+            writer = csv.writer(f)
+            for i, hms in enumerate(clocks):
+                timestamp = f"{date_str} {hms}"
+                temp_f, humidity, light = values[i] if values else (f"{70 + i % 10:.1f}", 40 + i % 10, "LIGHT")
+                f.flush()
+                offset = f.tell()
+                writer.writerow([timestamp, temp_f, humidity, light])
+                if index:
+                    f.flush()
+                    csv_index.note_row(path, timestamp, offset)
+        return path
+
+    return write
+
+
+@pytest.fixture
+def client(data_dir):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from web import app as webapp
+
+    return TestClient(webapp.app)
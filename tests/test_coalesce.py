@@ -0,0 +1,105 @@
+"""
+Single-flight test for the web app (no hardware needed).
+
+What it does:
+- Checks that concurrent identical keys run the work once
+- Checks TTL expiry, that failures are not cached and that ttl=0 never caches
+- Checks that one caller being cancelled does not cancel the shared work
+
+Run:
+  python -m pytest tests/test_coalesce.py
+"""
+
+import asyncio
+
+from web.coalesce import SingleFlight
+
+
+class Work:
+    """Counts calls; each call waits `delay` then returns the call number."""
+
+    def __init__(self, delay: float = 0.05, fail: bool = False) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return self.calls
+
+
+def test_concurrent_keys_run_once() -> None:
+    async def scenario() -> None:
+        flight = SingleFlight(ttl=1.0)
+        work = Work()
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(20)))
+        assert results == [1] * 20
+        assert work.calls == 1
+
+        # A different key is independent
+        assert await flight.do("other", work) == 2
+
+    asyncio.run(scenario())
+
+
+def test_cached_value_expires_after_ttl() -> None:
+    async def scenario() -> None:
+        flight = SingleFlight(ttl=0.1)
+        work = Work(delay=0)
+        assert await flight.do("k", work) == 1
+        assert await flight.do("k", work) == 1  # served from cache
+        await asyncio.sleep(0.15)
+        assert await flight.do("k", work) == 2
+        assert work.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_exceptions_are_not_cached() -> None:
+    async def scenario() -> None:
+        flight = SingleFlight(ttl=10.0)
+        work = Work(fail=True)
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert work.calls == 1
+
+        work.fail = False
+        assert await flight.do("k", work) == 2
+
+    asyncio.run(scenario())
+
+
+def test_ttl_zero_never_caches() -> None:
+    async def scenario() -> None:
+        flight = SingleFlight(ttl=10.0)
+        work = Work(delay=0.05)
+        # Concurrent callers still share one run...
+        results = await asyncio.gather(*(flight.do("plot", work, ttl=0) for _ in range(3)))
+        assert results == [1, 1, 1]
+        # ...but the next call does the work again
+        assert await flight.do("plot", work, ttl=0) == 2
+        assert work.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_shared_work() -> None:
+    async def scenario() -> None:
+        flight = SingleFlight(ttl=1.0)
+        work = Work(delay=0.1)
+        leaver = asyncio.ensure_future(flight.do("k", work))
+        stayer = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.02)
+
+        leaver.cancel()
+        assert await stayer == 1
+        assert leaver.cancelled()
+        assert work.calls == 1
+        # The result was cached despite the cancellation
+        assert await flight.do("k", work) == 1
+
+    asyncio.run(scenario())
+
@@ -0,0 +1,206 @@
+"""
+Binary columns test for the web app (no hardware needed).
+
+What it does:
+- Decodes encode_packed() output with struct and checks the ENVC layout
+  documented in web/columns.py (header, column offsets, NaN / 255 markers)
+- Drives ColumnCache on a temporary file: only appended rows are parsed,
+  truncated or replaced files are re-parsed, a half-written row is left out
+- Checks read_from() paging and next offsets
+
+Run:
+  python tests/test_columns.py
+  (or: python -m pytest tests/test_columns.py)
+"""
+
+import math
+import os
+import struct
+
+import pytest
+
+from web import columns
+
+HEADER = "timestamp,temp_f,humidity,light\r\n"
+
+
+def row(clock: str, temp: str = "70.0", humidity: str = "40", light: str = "LIGHT") -> str:
+    return f"2024-05-01 {clock},{temp},{humidity},{light}\r\n"
+
+
+def write(path: str, text: str, mode: str = "a") -> None:
+    with open(path, mode, newline="") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "readings_2024-05-01.csv")
+
+
+@pytest.fixture
+def parsed(monkeypatch) -> list[int]:
+    """Rows parsed by each columns._append_lines call."""
+    calls: list[int] = []
+    original = columns._append_lines
+
+    def counting(cols, lines, starts):
+        calls.append(len(lines))
+        return original(cols, lines, starts)
+
+    monkeypatch.setattr(columns, "_append_lines", counting)
+    return calls
+
+
+def test_packed_layout(path) -> None:
+    write(
+        path,
+        HEADER + row("00:00:00", "71.5", "40", "LIGHT") + row("00:05:00", "", "41", "DARK") + row("00:10:00", "72.0", "n/a", "???"),
+        "w",
+    )
+    body = columns.encode_packed(columns.read_span(path, len(HEADER), os.path.getsize(path)))
+
+    n = 3
+    magic, version, ncols, count, reserved = struct.unpack_from("<4sHHII", body, 0)
+    assert (magic, version, ncols, count, reserved) == (b"ENVC", 1, 4, n, 0)
+    assert len(body) == 16 + 4 * n * 3 + n
+
+    epoch = struct.unpack_from(f"<{n}I", body, 16)
+    temp_f = struct.unpack_from(f"<{n}f", body, 16 + 4 * n)
+    humidity = struct.unpack_from(f"<{n}f", body, 16 + 8 * n)
+    light = struct.unpack_from(f"<{n}B", body, 16 + 12 * n)
+
+    assert epoch[0] == columns.epoch_for("2024-05-01 00:00:00")
+    assert [b - a for a, b in zip(epoch, epoch[1:])] == [300, 300]
+    assert temp_f[0] == 71.5 and math.isnan(temp_f[1]) and temp_f[2] == 72.0
+    assert humidity[:2] == (40.0, 41.0) and math.isnan(humidity[2])
+    assert light == (1, 0, columns.LIGHT_UNKNOWN)
+
+
+def test_packed_empty() -> None:
+    body = columns.encode_packed(columns.Columns())
+    assert body == struct.pack("<4sHHII", b"ENVC", 1, 4, 0, 0)
+
+
+def test_cache_parses_only_appended_rows(path, parsed) -> None:
+    cache = columns.ColumnCache()
+    write(path, HEADER + row("00:00:00") + row("00:05:00"), "w")
+
+    _, n, end = cache.load(path)
+    assert n == 2 and end == os.path.getsize(path)
+
+    # Unchanged file: nothing parsed
+    cache.load(path)
+    assert parsed == [2]
+
+    write(path, row("00:10:00"))
+    _, n, end = cache.load(path)
+    assert parsed == [2, 1]
+    assert n == 3 and end == os.path.getsize(path)
+
+
+def test_cache_skips_half_written_row(path) -> None:
+    cache = columns.ColumnCache()
+    write(path, HEADER + row("00:00:00") + "2024-05-01 00:05:00,70", "w")
+
+    _, n, end = cache.load(path)
+    assert n == 1
+    assert end == len(HEADER) + len(row("00:00:00"))
+
+    write(path, ".5,40,DARK\r\n")
+    cols, n, end = cache.load(path)
+    assert n == 2 and cols.temp_f[1] == 70.5 and cols.light[1] == 0
+    assert end == os.path.getsize(path)
+
+
+def test_cache_reparses_truncated_file(path, parsed) -> None:
+    cache = columns.ColumnCache()
+    write(path, HEADER + row("00:00:00") + row("00:05:00") + row("00:10:00"), "w")
+    assert cache.load(path)[1] == 3
+
+    with open(path, "r+b") as f:  # same inode, shorter
+        f.truncate(len(HEADER) + len(row("00:00:00")))
+    assert cache.load(path)[1] == 1
+    assert parsed == [3, 1]
+
+
+def test_cache_reparses_replaced_file(path) -> None:
+    cache = columns.ColumnCache()
+    write(path, HEADER + row("00:00:00", "70.0"), "w")
+    assert cache.load(path)[0].temp_f[0] == 70.0
+
+    # Replaced by a longer file with a new inode: must not be treated as an append
+    write(path + ".new", HEADER + row("00:00:00", "65.0") + row("00:05:00", "66.0"), "w")
+    os.replace(path + ".new", path)
+
+    cols, n, _ = cache.load(path)
+    assert list(cols.temp_f[:n]) == [65.0, 66.0]
+
+
+def test_read_from_pages_and_next_offset(path) -> None:
+    cache = columns.ColumnCache()
+    clocks = ["00:00:00", "00:05:00", "00:10:00", "00:15:00", "00:20:00"]
+    write(path, HEADER + "".join(row(c) for c in clocks), "w")
+    size = os.path.getsize(path)
+    row_len = len(row("00:00:00"))
+
+    page, next_offset = cache.read_from(path, 0, limit=2)
+    assert len(page) == 2
+    assert next_offset == len(HEADER) + 2 * row_len  # start of the third row
+
+    page, next_offset = cache.read_from(path, next_offset, limit=2)
+    assert len(page) == 2 and list(page.starts) == [len(HEADER) + 2 * row_len, len(HEADER) + 3 * row_len]
+
+    page, next_offset = cache.read_from(path, next_offset, limit=2)
+    assert len(page) == 1 and next_offset == size
+
+    # Caught up: empty page, cursor stays at the end
+    page, next_offset = cache.read_from(path, size, limit=2)
+    assert len(page) == 0 and next_offset == size
+
+
+def test_read_from_until(path) -> None:
+    cache = columns.ColumnCache()
+    write(path, HEADER + row("00:00:00") + row("00:05:00") + row("00:10:00"), "w")
+
+    page, next_offset = cache.read_from(path, 0, until="2024-05-01 00:05:00")
+    assert len(page) == 2
+    assert next_offset == len(HEADER) + 2 * len(row("00:00:00"))
+
+
+def test_reads_ignore_rows_appended_concurrently(path, monkeypatch) -> None:
+    cache = columns.ColumnCache()
+    row_len = len(row("00:00:00"))
+    load = cache.load
+
+    def load_then_append(p):
+        # Another request refreshes the shared buffers right after our load
+        result = load(p)
+        write(p, row("00:10:00") + row("00:15:00"))
+        load(p)
+        return result
+
+    monkeypatch.setattr(cache, "load", load_then_append)
+
+    write(path, HEADER + row("00:00:00") + row("00:05:00"), "w")
+    page, next_offset = cache.read_from(path, 0)
+    assert len(page) == 2
+    assert next_offset == len(HEADER) + 2 * row_len
+
+    # The next poll starts exactly at the rows it has not seen
+    page, next_offset = cache.read_from(path, next_offset)
+    assert list(page.starts) == [len(HEADER) + 2 * row_len, len(HEADER) + 3 * row_len]
+    assert next_offset == len(HEADER) + 4 * row_len
+
+    cols, end = cache.tail(path, 10)
+    assert len(cols) == 6
+    assert end == cols.starts[-1] + row_len
+
+
+def test_tail(path) -> None:
+    cache = columns.ColumnCache()
+    write(path, HEADER + row("00:00:00") + row("00:05:00") + row("00:10:00"), "w")
+
+    cols, end = cache.tail(path, 2)
+    assert [e - cols.epoch[0] for e in cols.epoch] == [0, 300]
+    assert end == os.path.getsize(path)
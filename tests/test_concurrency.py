@@ -0,0 +1,57 @@
+"""
+Concurrency test for the web app (no hardware needed).
+
+What it does:
+- Puts a fake `journalctl` that sleeps on PATH
+- Fires more slow /api/logs requests than there are IO_WORKERS and checks
+  that /api/latest still answers quickly while they are in flight
+
+Run:
+  python -m pytest tests/test_concurrency.py
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from web import app as webapp
+
+JOURNAL_SLEEP_SECONDS = 2.0
+
+
+@pytest.fixture
+def slow_journalctl(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "journalctl"
+    script.write_text(f"#!/bin/sh\nsleep {JOURNAL_SLEEP_SECONDS}\necho fake journal\n")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+def test_latest_is_fast_while_logs_are_slow(data_dir, write_day, slow_journalctl) -> None:
+    httpx = pytest.importorskip("httpx")
+    write_day(webapp.today_str(), ["00:00:00", "00:05:00"])
+
+    async def scenario() -> tuple[float, list[int]]:
+        transport = httpx.ASGITransport(app=webapp.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Distinct `lines` values so the single-flight layer cannot merge them
+            logs = [
+                asyncio.ensure_future(client.get("/api/logs", params={"lines": 10 * (i + 1)}))
+                for i in range(webapp.IO_WORKERS)
+            ]
+            await asyncio.sleep(0.2)
+
+            started = time.perf_counter()
+            latest = await client.get("/api/latest")
+            elapsed = time.perf_counter() - started
+            assert latest.json()["data"]["timestamp"].endswith("00:05:00")
+
+            return elapsed, [resp.status_code for resp in await asyncio.gather(*logs)]
+
+    elapsed, statuses = asyncio.run(scenario())
+    assert statuses == [200] * webapp.IO_WORKERS
+    assert elapsed < JOURNAL_SLEEP_SECONDS / 2
@@ -0,0 +1,227 @@
+"""
+Sparse time index test (no hardware needed).
+
+What it does:
+- Logs rows the way software/main.py does (CSV row + csv_index.note_row)
+  into a temporary data directory
+- Checks offset_at / offset_after / read_rows_from(until=) against a
+  brute-force scan, including exact indexed timestamps and repeated ones
+- Checks rebuilding a missing or corrupt sidecar, scanning past an index
+  that stops short, reading only appended sidecar bytes, and that today's
+  sidecar is never replaced under the logger
+- Checks that windowed binary reads parse only the window
+
+Run:
+  python -m pytest tests/test_csv_index.py
+"""
+
+import os
+import time
+
+import pytest
+
+from software import csv_index
+from web import app as webapp
+from web import columns, readings
+
+PAST_DAY = "2024-05-01"
+
+
+def clock(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+@pytest.fixture
+def log_rows(write_day):
+    def log(date_str: str, seconds: list[int], index: bool = True) -> str:
+        """Append rows like the logger; note_row() them unless `index` is False."""
+        return write_day(date_str, [clock(s) for s in seconds], index=index)
+
+    return log
+
+
+def brute_force(path: str) -> tuple[list[tuple[str, int]], int]:
+    """(timestamp, offset) of every complete row and the end offset."""
+    rows = []
+    with open(path, "rb") as f:
+        pos = len(f.readline())
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            rows.append((raw[:19].decode(), pos))
+            pos += len(raw)
+    return rows, pos
+
+
+def expected(scan: tuple[list[tuple[str, int]], int], timestamp: str, strict: bool) -> int:
+    rows, end = scan
+    for ts, offset in rows:
+        if ts > timestamp or (ts == timestamp and not strict):
+            return offset
+    return end
+
+
+def probes(date_str: str) -> list[str]:
+    # Every 70 s hits row times, gaps between rows and past both ends
+    return [f"{date_str} {clock(s)}" for s in range(0, 86400, 70)] + [f"{date_str} 23:59:59"]
+
+
+def assert_seeks_match(path: str, date_str: str) -> None:
+    scan = brute_force(path)
+    for ts in probes(date_str):
+        assert readings.offset_at(path, ts) == expected(scan, ts, strict=False), ts
+        assert readings.offset_after(path, ts) == expected(scan, ts, strict=True), ts
+
+
+def test_index_stays_sparse_at_sample_rate(log_rows) -> None:
+    # One day at the loggers' 300 s sample period
+    path = log_rows(PAST_DAY, list(range(0, 86400, 300)))
+    entries = csv_index.read_index(csv_index.index_path_for(path))
+    assert len(entries) == 24
+    assert [ts[11:] for ts, _ in entries[:3]] == ["00:00:00", "01:00:00", "02:00:00"]
+
+
+def test_seeks_match_brute_force(log_rows) -> None:
+    # 20 s apart with a few repeated timestamps
+    seconds = sorted(list(range(0, 40000, 20)) + [3600, 3600, 7200, 20000])
+    path = log_rows(PAST_DAY, seconds)
+    assert len(csv_index.load_index(path)) > 5
+    assert_seeks_match(path, PAST_DAY)
+
+
+def test_strict_at_exact_indexed_timestamp(log_rows) -> None:
+    path = log_rows(PAST_DAY, list(range(0, 20000, 30)) + [20000, 20000])
+    entries = csv_index.load_index(path)
+    rows, end = brute_force(path)
+    offsets = [offset for _, offset in rows]
+    assert len(entries) > 3
+
+    for ts, offset in entries[1:]:
+        # Non-strict lands on the indexed row, strict on the row after it
+        assert readings.offset_at(path, ts) == offset
+        assert readings.offset_after(path, ts) == offsets[offsets.index(offset) + 1]
+
+    # Strict skips every row sharing the timestamp
+    assert readings.offset_at(path, f"{PAST_DAY} 05:33:20") == rows[-2][1]
+    assert readings.offset_after(path, f"{PAST_DAY} 05:33:20") == end
+
+
+def test_missing_sidecar_is_rebuilt(log_rows) -> None:
+    path = log_rows(PAST_DAY, list(range(0, 30000, 60)), index=False)
+    idx_path = csv_index.index_path_for(path)
+    assert not os.path.exists(idx_path)
+
+    assert_seeks_match(path, PAST_DAY)
+    # A past day is no longer written: the rebuild is persisted
+    assert csv_index.read_index(idx_path) == csv_index.load_index(path)
+    assert len(csv_index.read_index(idx_path)) > 5
+
+
+def test_corrupt_sidecar_is_rebuilt(log_rows) -> None:
+    path = log_rows(PAST_DAY, list(range(0, 30000, 60)))
+    idx_path = csv_index.index_path_for(path)
+    with open(idx_path, "w") as f:
+        f.write(f"{PAST_DAY} 01:00:00,7\n{PAST_DAY} 02:00:00,99\n")
+
+    assert_seeks_match(path, PAST_DAY)
+    entries = csv_index.read_index(idx_path)
+    rows, _ = brute_force(path)
+    assert entries[0] == rows[0]
+    assert set(entries) <= set(rows)
+
+
+def test_scans_past_index_that_stops_short(log_rows) -> None:
+    log_rows(PAST_DAY, list(range(0, 3000, 10)))
+    # Rows logged without the index: far more than STALE_BYTES
+    path = log_rows(PAST_DAY, list(range(3000, 60000, 10)), index=False)
+    assert os.path.getsize(path) > 4 * csv_index.STALE_BYTES
+
+    entries = csv_index.load_index(path)
+    assert entries[-1][0] > f"{PAST_DAY} 15:00:00"
+    assert_seeks_match(path, PAST_DAY)
+
+
+def test_reads_only_appended_sidecar_bytes(log_rows, monkeypatch) -> None:
+    today = time.strftime("%Y-%m-%d")
+    path = log_rows(today, list(range(0, 20000, 300)))
+    idx_path = csv_index.index_path_for(path)
+    csv_index.load_index(path)
+    consumed = os.path.getsize(idx_path)
+
+    reads: list[int] = []
+    original = csv_index._read_entries
+
+    def recording(idx, pos=0):
+        reads.append(pos)
+        return original(idx, pos)
+
+    monkeypatch.setattr(csv_index, "_read_entries", recording)
+    assert csv_index.load_index(path)  # sidecar unchanged: not read
+    assert reads == []
+
+    log_rows(today, list(range(20000, 40000, 300)))
+    entries = csv_index.load_index(path)
+    assert reads == [consumed]
+    assert entries == csv_index.read_index(idx_path)
+    assert_seeks_match(path, today)
+
+
+def test_todays_sidecar_is_not_replaced(log_rows) -> None:
+    today = time.strftime("%Y-%m-%d")
+    path = log_rows(today, list(range(0, 30000, 60)), index=False)
+    idx_path = csv_index.index_path_for(path)
+
+    # Reader rebuilds in memory; the logger stays the only writer
+    assert len(csv_index.load_index(path)) > 5
+    assert not os.path.exists(idx_path)
+
+    log_rows(today, [30000])
+    assert csv_index.read_index(idx_path) == [(f"{today} 08:20:00", brute_force(path)[0][-1][1])]
+    assert_seeks_match(path, today)
+
+    # Same for a corrupt sidecar: left for the logger to append to
+    with open(idx_path, "a") as f:
+        f.write(f"{today} 09:00:00,5\n")
+    with open(idx_path) as f:
+        before = f.read()
+    csv_index._reader_cache.clear()
+    assert_seeks_match(path, today)
+    with open(idx_path) as f:
+        assert f.read() == before
+
+
+def test_read_rows_until_matches_brute_force(log_rows) -> None:
+    path = log_rows(PAST_DAY, list(range(0, 40000, 45)))
+    rows, _ = brute_force(path)
+    start = readings.offset_at(path, f"{PAST_DAY} 01:00:00")
+    for until in (f"{PAST_DAY} 00:00:00", f"{PAST_DAY} 03:00:01", f"{PAST_DAY} 23:00:00"):
+        got, next_offset = readings.read_rows_from(path, start, until=until)
+        want = [ts for ts, _ in rows if f"{PAST_DAY} 01:00:00" <= ts <= until]
+        assert [row["timestamp"] for row in got] == want
+        assert next_offset == max(start, readings.offset_after(path, until))
+
+
+def test_windowed_binary_reads_parse_only_the_window(client, log_rows, monkeypatch) -> None:
+    log_rows("2024-05-01", list(range(0, 86400, 60)))
+    log_rows("2024-05-02", list(range(0, 86400, 60)))
+
+    parsed: list[int] = []
+    original = columns._append_lines
+
+    def counting(cols, lines, starts):
+        parsed.append(len(lines))
+        return original(cols, lines, starts)
+
+    monkeypatch.setattr(columns, "_append_lines", counting)
+    params = {"start": "2024-05-01 23:00", "end": "2024-05-02 01:00", "format": "columns"}
+    resp = client.get("/api/range", params=params)
+    assert resp.headers["X-Count"] == "121"  # 23:00 .. 01:00 inclusive
+    assert sum(parsed) == 121
+    assert len(webapp.COLUMN_CACHE._entries) == 0
+
+    # Same rows as the JSON path
+    data = client.get("/api/range", params={**params, "format": "json"}).json()
+    n = data["count"]
+    epochs = memoryview(resp.content)[16 : 16 + 4 * n].cast("I").tolist()
+    assert epochs == [columns.epoch_for(row["timestamp"]) for row in data["data"]]
+    assert resp.headers["X-Next-Cursor"] == data["next"]
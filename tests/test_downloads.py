@@ -0,0 +1,120 @@
+"""
+Download endpoint test for the web app (no hardware needed).
+
+What it does:
+- /download/export: 400 for unknown or unavailable formats, the
+  Content-Disposition filename, and the body being sent in several parts
+- /download/csv/{date}: 304 for a matching If-None-Match, 206 for Range,
+  and If-Range falling back to the full file once the file changed
+
+Run:
+  python -m pytest tests/test_downloads.py
+"""
+
+import asyncio
+import os
+
+from web import app as webapp
+from web import export
+
+DAYS = ["2024-05-01", "2024-05-02", "2024-05-03"]
+CLOCKS = ["00:00:00", "06:00:00", "12:00:00", "18:00:00"]
+
+
+def test_export_rejects_unknown_format(client, write_day) -> None:
+    write_day(DAYS[0], CLOCKS)
+    resp = client.get("/download/export", params={"start": DAYS[0], "end": DAYS[0], "format": "xlsx"})
+    assert resp.status_code == 400
+    assert resp.json()["formats"] == export.available_formats()
+
+
+def test_export_rejects_unavailable_format(client, write_day, monkeypatch) -> None:
+    write_day(DAYS[0], CLOCKS)
+    # As on a Pi without pyarrow
+    monkeypatch.setattr(export, "available_formats", lambda: ["csv", "csv.gz"])
+    resp = client.get("/download/export", params={"start": DAYS[0], "end": DAYS[0], "format": "parquet"})
+    assert resp.status_code == 400
+    assert resp.json()["formats"] == ["csv", "csv.gz"]
+
+
+def test_export_filename(client, write_day) -> None:
+    for day in DAYS:
+        write_day(day, CLOCKS)
+
+    params = {"start": DAYS[0], "end": DAYS[-1], "format": "csv.gz"}
+    resp = client.get("/download/export", params=params)
+    assert resp.status_code == 200
+    assert resp.headers["content-disposition"] == 'attachment; filename="readings_2024-05-01_2024-05-03.csv.gz"'
+    assert resp.content == b"".join(export.export_chunks("csv.gz", DAYS, None, None))
+
+
+def test_export_is_streamed(data_dir, write_day, monkeypatch) -> None:
+    for day in DAYS:
+        write_day(day, CLOCKS)
+    monkeypatch.setattr(export, "CHUNK_BYTES", 64)
+
+    # Drive the ASGI app directly: TestClient would join the body parts
+    messages: list[dict] = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive() -> dict:
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/download/export",
+        "raw_path": b"/download/export",
+        "query_string": f"start={DAYS[0]}&end={DAYS[-1]}&format=csv".encode(),
+        "headers": [],
+        "client": ("test", 0),
+        "server": ("test", 80),
+    }
+    asyncio.run(webapp.app(scope, receive, send))
+
+    start, *bodies = messages
+    assert start["status"] == 200
+    assert b"content-length" not in dict(start["headers"])
+    parts = [m["body"] for m in bodies if m["body"]]
+    assert len(parts) > len(DAYS)
+    assert all(len(part) <= 64 for part in parts[1:])
+    assert b"".join(parts) == b"".join(export.export_chunks("csv", DAYS, None, None))
+
+
+def test_csv_download_etag_and_range(client, write_day) -> None:
+    path = write_day(DAYS[0], CLOCKS)
+    url = f"/download/csv/{DAYS[0]}"
+    with open(path, "rb") as f:
+        body = f.read()
+
+    full = client.get(url)
+    assert full.status_code == 200 and full.content == body
+    etag = full.headers["etag"]
+    assert full.headers["last-modified"]
+
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b"" and not_modified.headers["etag"] == etag
+
+    partial = client.get(url, headers={"Range": "bytes=10-"})
+    assert partial.status_code == 206
+    assert partial.content == body[10:]
+    assert partial.headers["content-range"] == f"bytes 10-{len(body) - 1}/{len(body)}"
+
+    resumed = client.get(url, headers={"Range": "bytes=10-19", "If-Range": etag})
+    assert resumed.status_code == 206 and resumed.content == body[10:20]
+
+    # The file changed since the ETag was issued: send all of it
+    write_day(DAYS[0], ["23:00:00"])
+    os.utime(path, (os.path.getmtime(path) + 5,) * 2)
+    changed = client.get(url, headers={"Range": "bytes=10-19", "If-Range": etag})
+    assert changed.status_code == 200
+    assert len(changed.content) == os.path.getsize(path)
@@ -0,0 +1,94 @@
+"""
+Bulk export test for the web app (no hardware needed).
+
+What it does:
+- Runs export_chunks() over a temporary data directory
+- Checks one CSV header across several days, days without a file being
+  skipped, and the first / last day being cut at timestamp bounds
+- Checks that csv.gz decompresses to the same bytes as csv
+- Checks one Parquet row group per day (only when pyarrow is installed)
+
+Run:
+  python -m pytest tests/test_export.py
+"""
+
+import csv
+import gzip
+import io
+
+import pytest
+
+from web import columns, export, readings
+
+DAYS = ["2024-05-01", "2024-05-02", "2024-05-03"]
+CLOCKS = ["00:00:00", "06:00:00", "12:00:00", "18:00:00"]
+VALUES = [(f"{70 + i:.1f}", 40 + i, "DARK" if i % 2 else "LIGHT") for i in range(len(CLOCKS))]
+
+
+@pytest.fixture
+def make_days(write_day):
+    def make(days: list[str]) -> None:
+        for day in days:
+            write_day(day, CLOCKS, VALUES)
+
+    return make
+
+
+def run_export(fmt: str, days: list[str], start=None, end=None) -> bytes:
+    return b"".join(export.export_chunks(fmt, days, start, end))
+
+
+def timestamps(body: bytes) -> list[str]:
+    return [row["timestamp"] for row in csv.DictReader(io.StringIO(body.decode()))]
+
+
+def test_csv_header_once_and_missing_days_skipped(make_days) -> None:
+    make_days([DAYS[0], DAYS[2]])  # 2024-05-02 has no file
+
+    body = run_export("csv", DAYS)
+    assert body.count(b"timestamp,temp_f") == 1
+    assert body.startswith(export.CSV_HEADER)
+    assert timestamps(body) == [f"{day} {clock}" for day in (DAYS[0], DAYS[2]) for clock in CLOCKS]
+
+    # Rows are copied byte for byte
+    with open(readings.csv_path_for(DAYS[0]), "rb") as f:
+        f.readline()
+        assert f.read() in body
+
+
+def test_csv_cut_at_timestamp_bounds(make_days) -> None:
+    make_days(DAYS)
+
+    body = run_export("csv", DAYS, "2024-05-01 12:00:00", "2024-05-03 06:00:00")
+    assert timestamps(body) == [
+        "2024-05-01 12:00:00",
+        "2024-05-01 18:00:00",
+        *(f"2024-05-02 {clock}" for clock in CLOCKS),
+        "2024-05-03 00:00:00",
+        "2024-05-03 06:00:00",
+    ]
+
+    # A window inside one day
+    body = run_export("csv", DAYS[1:2], "2024-05-02 05:00:00", "2024-05-02 13:00:00")
+    assert timestamps(body) == ["2024-05-02 06:00:00", "2024-05-02 12:00:00"]
+
+
+def test_csv_gz_matches_csv(make_days) -> None:
+    make_days(DAYS)
+    for bounds in ((None, None), ("2024-05-01 06:00:00", "2024-05-02 12:00:00")):
+        assert gzip.decompress(run_export("csv.gz", DAYS, *bounds)) == run_export("csv", DAYS, *bounds)
+
+
+def test_parquet_row_group_per_day(make_days) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    make_days([DAYS[0], DAYS[2]])
+
+    parquet = pq.ParquetFile(io.BytesIO(run_export("parquet", DAYS)))
+    assert parquet.metadata.num_row_groups == 2
+    assert [parquet.metadata.row_group(i).num_rows for i in range(2)] == [4, 4]
+
+    table = parquet.read()
+    epochs = [int(ts.timestamp()) for ts in table.column("timestamp").to_pylist()]
+    assert epochs == [columns.epoch_for(f"{day} {clock}") for day in (DAYS[0], DAYS[2]) for clock in CLOCKS]
+    assert table.column("light").to_pylist()[:2] == ["LIGHT", "DARK"]
+
@@ -0,0 +1,135 @@
+"""
+LCD worker test (no hardware needed).
+
+What it does:
+- Drives LCDWorker against FakeCharLCD
+- Checks that only changed character cells go over I2C
+- Checks that posting state never blocks and the latest value wins
+
+Run:
+  python tests/test_lcd_worker.py
+  (or: python -m pytest tests/test_lcd_worker.py)
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "software"))
+
+from lcd_display import FakeCharLCD, LCDWorker, changed_runs  # noqa: E402
+
+
+def render_lines(state: dict, now: float) -> tuple[str, str]:
+    return state["lines"]
+
+
+def test_changed_runs() -> None:
+    assert changed_runs("ABCDEF", "ABCDEF") == []
+    assert changed_runs("ABCDEF", "AXCDEF") == [(1, 2)]
+    # One unchanged cell between edits is cheaper to rewrite than to skip
+    assert changed_runs("ABCDEF", "XBXDEF") == [(0, 3)]
+    assert changed_runs("ABCDEF", "XBCDEX") == [(0, 1), (5, 6)]
+    assert changed_runs("", "AB") == [(0, 2)]
+
+
+def test_first_frame_is_full_redraw() -> None:
+    lcd = FakeCharLCD()
+    worker = LCDWorker(lcd, render_lines)
+
+    worker.draw(("T:72.5F H:40%", "LIGHT 12:00:00"))
+
+    assert lcd.lines() == ["T:72.5F H:40%   ", "LIGHT 12:00:00  "]
+    assert lcd.chars == 32
+    assert lcd.commands == 2  # one cursor move per row
+
+
+def test_clock_tick_sends_only_changed_cells() -> None:
+    lcd = FakeCharLCD()
+    worker = LCDWorker(lcd, render_lines)
+    worker.draw(("T:72.5F H:40%", "LIGHT 12:00:00"))
+    lcd.reset_counts()
+
+    worker.draw(("T:72.5F H:40%", "LIGHT 12:00:01"))
+
+    assert lcd.lines()[1] == "LIGHT 12:00:01  "
+    assert lcd.chars == 1
+    assert lcd.commands == 1
+
+    # Identical frame: no I2C traffic at all
+    lcd.reset_counts()
+    worker.draw(("T:72.5F H:40%", "LIGHT 12:00:01"))
+    assert lcd.bytes_sent == 0
+
+
+def test_old_full_rewrite_costs_more() -> None:
+    lcd = FakeCharLCD()
+    worker = LCDWorker(lcd, render_lines)
+    worker.draw(("T:72.5F H:40%", "LIGHT 12:00:00"))
+    lcd.reset_counts()
+    worker.draw(("T:72.6F H:40%", "LIGHT 12:05:00"))
+    diff_bytes = lcd.bytes_sent
+
+    # What lcd_write used to do: home() + 16 chars + cursor move + 16 chars
+    assert diff_bytes < 1 + 16 + 1 + 16
+
+
+def test_post_is_non_blocking_and_latest_wins() -> None:
+    lcd = FakeCharLCD()
+    worker = LCDWorker(lcd, render_lines, tick_seconds=0.05).start()
+
+    start = time.perf_counter()
+    for i in range(1000):
+        worker.post(lines=(f"frame {i}", ""))
+    elapsed = time.perf_counter() - start
+
+    worker.stop()
+
+    assert elapsed < 0.5
+    assert lcd.lines()[0] == "frame 999".ljust(16)
+    # Far fewer draws than posts: intermediate frames were coalesced
+    assert lcd.chars < 1000
+
+
+def test_i2c_error_forces_full_redraw() -> None:
+    lcd = FakeCharLCD(fail_writes=1)
+    worker = LCDWorker(lcd, render_lines, tick_seconds=0.02).start()
+
+    worker.post(lines=("Env Monitor", "Starting..."))
+    time.sleep(0.2)
+    worker.stop()
+
+    assert worker.errors == 1
+    assert lcd.lines() == ["Env Monitor".ljust(16), "Starting...".ljust(16)]
+
+
+def test_connect_runs_on_worker_thread() -> None:
+    lcd = FakeCharLCD()
+    connected_on = []
+
+    def connect() -> FakeCharLCD:
+        connected_on.append(threading.current_thread().name)
+        return lcd
+
+    worker = LCDWorker(None, render_lines, tick_seconds=0.02, connect=connect)
+
+    worker.start()
+    worker.post(lines=("Env Monitor", "Starting..."))
+    time.sleep(0.1)
+    worker.stop()
+
+    assert connected_on == ["lcd-worker"]
+    assert worker.lcd is lcd
+    assert lcd.lines()[0] == "Env Monitor".ljust(16)
+
+
+def main() -> None:
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Delta cursor test for the web app (no hardware needed).
+
+What it does:
+- Checks every `since` cursor form web/readings.py accepts, and rejects junk
+- Checks that a row the logger is still writing is never consumed
+- Polls /api/today and /api/range against a temporary data directory:
+  cursor reset on a new day or replaced file, and paging across days with
+  `next`
+
+Run:
+  python -m pytest tests/test_readings.py
+"""
+
+import os
+
+import pytest
+
+from web import app as webapp
+from web import readings
+
+HEADER_LEN = len("timestamp,temp_f,humidity,light\r\n")
+
+
+def stamps(data: list[dict]) -> list[str]:
+    return [row["timestamp"][11:] for row in data]
+
+
+def test_parse_cursor_forms() -> None:
+    assert readings.parse_cursor("2024-05-01:123") == ("2024-05-01", 123, None)
+    assert readings.parse_cursor(" 123 ") == (None, 123, None)
+    assert readings.parse_cursor("2024-05-01 10:00") == (None, None, "2024-05-01 10:00:00")
+    assert readings.parse_cursor("2024-05-01T10:00:05") == (None, None, "2024-05-01 10:00:05")
+
+    for bad in ("", "abc", "-5", "2024-13-01:5", "2024-05-01:x", "2024-05-01 25:00"):
+        with pytest.raises(ValueError):
+            readings.parse_cursor(bad)
+
+
+def test_valid_offset(data_dir, write_day) -> None:
+    path = write_day("2024-05-01", ["00:00:00", "00:05:00"])
+    size = os.path.getsize(path)
+
+    assert readings.valid_offset(path, 0)
+    assert readings.valid_offset(path, HEADER_LEN)
+    assert not readings.valid_offset(path, HEADER_LEN + 3)  # mid-row
+    assert readings.valid_offset(path, size)
+    assert not readings.valid_offset(path, size + 1)
+    assert not readings.valid_offset(str(data_dir / "missing.csv"), 10)
+
+
+def test_partial_last_line_is_not_consumed(write_day) -> None:
+    path = write_day("2024-05-01", ["00:00:00", "00:05:00"])
+    with open(path, "a", newline="") as f:
+        f.write("2024-05-01 00:10:00,72.0")  # logger mid-write
+    partial_at = os.path.getsize(path) - len("2024-05-01 00:10:00,72.0")
+
+    rows, next_offset = readings.read_rows_from(path)
+    assert stamps(rows) == ["00:00:00", "00:05:00"]
+    assert next_offset == partial_at
+
+    with open(path, "a", newline="") as f:
+        f.write(",42,DARK\r\n")
+    rows, next_offset = readings.read_rows_from(path, next_offset)
+    assert rows == [{"timestamp": "2024-05-01 00:10:00", "temp_f": "72.0", "humidity": "42", "light": "DARK"}]
+    assert next_offset == os.path.getsize(path)
+
+
+def test_read_rows_limit(write_day) -> None:
+    path = write_day("2024-05-01", ["00:00:00", "00:05:00", "00:10:00", "00:15:00"])
+
+    rows, next_offset = readings.read_rows_from(path, limit=2)
+    assert stamps(rows) == ["00:00:00", "00:05:00"]
+    rows, _ = readings.read_rows_from(path, next_offset, limit=2)
+    assert stamps(rows) == ["00:10:00", "00:15:00"]
+
+
+def test_offset_after_timestamp(write_day) -> None:
+    path = write_day("2024-05-01", ["00:00:00", "00:05:00", "00:10:00"])
+    rows, _ = readings.read_rows_from(path, readings.offset_after(path, "2024-05-01 00:05:00"))
+    assert stamps(rows) == ["00:10:00"]
+    assert readings.offset_after(path, "2024-05-01 23:00:00") == os.path.getsize(path)
+
+
+def test_today_cursor_follows_appends(client, write_day) -> None:
+    today = webapp.today_str()
+    write_day(today, ["00:00:00", "00:05:00"])
+
+    first = client.get("/api/today").json()
+    assert first["count"] == 2
+
+    write_day(today, ["00:10:00"])
+    delta = client.get("/api/today", params={"since": first["next"]}).json()
+    assert stamps(delta["data"]) == ["00:10:00"]
+    assert delta["reset"] is False
+
+    # Nothing new: empty delta, same cursor
+    again = client.get("/api/today", params={"since": delta["next"]}).json()
+    assert again["data"] == [] and again["next"] == delta["next"]
+
+    # A timestamp cursor returns the rows after it
+    resp = client.get("/api/today", params={"since": f"{today} 00:00:00"}).json()
+    assert stamps(resp["data"]) == ["00:05:00", "00:10:00"]
+
+
+def test_today_cursor_resets_on_new_day(client, write_day) -> None:
+    write_day(webapp.today_str(), ["00:00:00", "00:05:00"])
+
+    resp = client.get("/api/today", params={"since": "2000-01-01:34"}).json()
+    assert resp["reset"] is True
+    assert stamps(resp["data"]) == ["00:00:00", "00:05:00"]
+
+
+def test_today_cursor_resets_on_replaced_file(client, write_day) -> None:
+    today = webapp.today_str()
+    path = write_day(today, ["00:00:00", "00:05:00", "00:10:00"])
+    cursor = client.get("/api/today").json()["next"]
+
+    # Rewritten with different row lengths: the old offset is now mid-row
+    os.remove(path)
+    write_day(today, ["00:00:00", "00:05:00", "00:10:00"], [("70.25", 40, "LIGHT")] * 3)
+    assert not readings.valid_offset(path, readings.parse_cursor(cursor)[1])
+
+    resp = client.get("/api/today", params={"since": cursor}).json()
+    assert resp["reset"] is True
+    assert resp["count"] == 3
+
+
+def test_today_rejects_bad_cursor(client) -> None:
+    assert client.get("/api/today", params={"since": "not-a-cursor"}).status_code == 400
+
+
+def test_range_pages_across_days(client, write_day) -> None:
+    write_day("2024-05-01", ["23:50:00", "23:55:00"])
+    # 2024-05-02 missing: skipped
+    write_day("2024-05-03", ["00:00:00", "00:05:00", "00:10:00"])
+
+    seen: list[str] = []
+    params = {"start": "2024-05-01", "end": "2024-05-03", "limit": 2}
+    for _ in range(10):
+        resp = client.get("/api/range", params=params).json()
+        seen += [row["timestamp"] for row in resp["data"]]
+        params["since"] = resp["next"]
+        if not resp["more"]:
+            break
+    else:
+        raise AssertionError("range never finished paging")
+
+    assert seen == [
+        "2024-05-01 23:50:00",
+        "2024-05-01 23:55:00",
+        "2024-05-03 00:00:00",
+        "2024-05-03 00:05:00",
+        "2024-05-03 00:10:00",
+    ]
+    assert params["since"].startswith("2024-05-03:")
+
+    # Following the last cursor picks up rows appended later
+    write_day("2024-05-03", ["00:15:00"])
+    resp = client.get("/api/range", params=params).json()
+    assert stamps(resp["data"]) == ["00:15:00"]
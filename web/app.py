@@ -7,28 +7,76 @@ Run (dev):
 Endpoints:
 - GET /api/latest         -> latest reading (JSON)
 - GET /api/today          -> today's readings (JSON list)
+- GET /api/today?since=   -> only rows appended after a cursor (delta sync)
+- GET /api/today?start=09:00&end=12:00 or ?last=3600 -> a time window of today
+- GET /api/range?start=&end=[&since=] -> readings across days (JSON list);
+  start/end are dates or timestamps
 - GET /api/logs?lines=50  -> last N log lines from systemd journal
 - GET /download/csv       -> download today's CSV file
+- GET /download/csv/YYYY-MM-DD -> download one day's CSV file
+- GET /download/export?start=&end=&format=csv|csv.gz|parquet
+                          -> streamed export over a range of days
 - GET /download/plot      -> download today's plot PNG if it exists
 - GET /                  -> simple dashboard page
+
+/api/today and /api/range negotiate their response format: JSON by default,
+packed binary columns for "Accept: application/x-envmon-columns" and Arrow
+IPC for "Accept: application/vnd.apache.arrow.stream" (if pyarrow is
+installed). `?format=json|columns|arrow` overrides the Accept header.
+
+Handlers are async. Data file reads run on a small bounded executor, plots
+on a separate one and journalctl as an asyncio subprocess, so slow work
+never queues data reads; identical concurrent requests are coalesced into
+one unit of work whose response is cached for CACHE_TTL_SECONDS
+(web/coalesce.py).
+
+Single-day downloads are FileResponses (ETag / Last-Modified, Range and
+If-Range, so interrupted downloads resume) plus a 304 for If-None-Match;
+bulk exports are generated chunk by chunk with bounded memory
+(web/export.py). Parquet is only offered when pyarrow is installed.
+
+Startup stays lightweight: plots are rendered in-process by
+software/plot_readings.py, which only imports matplotlib on first use.
 """
 
+import asyncio
 import csv
 import os
-import subprocess
-from datetime import datetime
-from typing import Any
-
-from fastapi import FastAPI, Query
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Optional
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse
 from fastapi import Response
 
+from software import plot_readings
+from web import columns, export, readings
+from web.coalesce import SingleFlight
+
 DATA_DIR = "data"
 TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 MONITOR_SERVICE = "environmental-monitor"  # your systemd service name
 
+IO_WORKERS = 4             # bounded executor for data file reads
+PLOT_WORKERS = 1           # plots render on their own executor
+CACHE_TTL_SECONDS = float(os.environ.get("ENVMON_CACHE_TTL", "1.0"))
+LOGS_CACHE_SECONDS = 5.0   # journal tails are the most expensive read
+JOURNAL_TIMEOUT_SECONDS = 10
+
 app = FastAPI(title="Environmental Monitor")
 
+# Parsed daily files for the binary formats (refreshed incrementally)
+COLUMN_CACHE = columns.ColumnCache()
+
+# Slow work (plots; journalctl runs as an asyncio subprocess) never holds
+# the threads data reads need
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="envmon-io")
+PLOT_EXECUTOR = ThreadPoolExecutor(max_workers=PLOT_WORKERS, thread_name_prefix="envmon-plot")
+SINGLE_FLIGHT = SingleFlight(ttl=CACHE_TTL_SECONDS)
+
 
 def today_str() -> str:
     return datetime.now().strftime("%Y-%m-%d")
@@ -56,8 +104,83 @@ def read_csv_rows(path: str) -> list[dict[str, Any]]:
     return rows
 
 
+def columns_response(cols: columns.Columns, fmt: str, next_cursor: str, reset: bool = False, more: bool = False) -> Response:
+    """Binary response; cursor metadata travels in headers."""
+    if fmt == "arrow":
+        body, media_type = columns.encode_arrow(cols), columns.MEDIA_ARROW
+    else:
+        body, media_type = columns.encode_packed(cols), columns.MEDIA_COLUMNS
+    headers = {
+        "X-Count": str(len(cols)),
+        "X-Next-Cursor": next_cursor,
+        "X-Reset": "1" if reset else "0",
+        "X-More": "1" if more else "0",
+        "Vary": "Accept",
+    }
+    return Response(body, media_type=media_type, headers=headers)
+
+
+def read_window_columns(
+    path: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    until: Optional[str] = None,
+) -> tuple[columns.Columns, int]:
+    """
+    Columnar read of a time window, bypassing COLUMN_CACHE: the end of the
+    span comes from the sidecar index, so only the window's rows are parsed.
+    """
+    stop = readings.offset_after(path, until) if until else sys.maxsize
+    return columns.read_window(path, offset, stop, limit)
+
+
+def file_download(request: Request, path: str, media_type: str) -> Response:
+    """FileResponse for `path`, or 304 if the client already has this version."""
+    response = FileResponse(path, media_type=media_type, filename=os.path.basename(path), stat_result=os.stat(path))
+    etag = response.headers["etag"]
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    return response
+
+
+async def run_io(fn: Callable[..., Any], *args: Any, executor: Optional[ThreadPoolExecutor] = None) -> Any:
+    """Run blocking work on a bounded executor (IO_EXECUTOR by default)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or IO_EXECUTOR, partial(fn, *args))
+
+
+async def coalesced(
+    request: Request,
+    build: Callable[..., Any],
+    *args: Any,
+    ttl: Optional[float] = None,
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> Response:
+    """
+    Run `build(*args)` once per distinct request (path, query, Accept),
+    sharing the rendered response with identical concurrent and recent
+    requests. Blocking builders run on `executor`; coroutine builders are
+    awaited directly.
+    """
+    key = (request.method, request.url.path, request.url.query, request.headers.get("accept", ""))
+
+    async def work() -> Response:
+        if asyncio.iscoroutinefunction(build):
+            result = await build(*args)
+        else:
+            result = await run_io(build, *args, executor=executor)
+        return result if isinstance(result, Response) else JSONResponse(result)
+
+    return await SINGLE_FLIGHT.do(key, work, ttl)
+
+
 @app.get("/api/latest")
-def api_latest():
+async def api_latest(request: Request):
+    return await coalesced(request, latest_response)
+
+
+def latest_response():
     path = today_csv_path()
     rows = read_csv_rows(path)
     if not rows:
@@ -78,40 +201,38 @@ def api_latest():
         pass
 
     return {"ok": True, "data": last}
+
+
 @app.post("/api/plot/today")
-def api_plot_today():
+async def api_plot_today(request: Request):
     """
-    Generate today's plot PNG on demand by calling your plot script.
+    Generate today's plot PNG on demand with the plot script's styling.
+    Concurrent clicks share one render.
     """
-    date_str = today_str()
+    return await coalesced(request, plot_today_response, ttl=0, executor=PLOT_EXECUTOR)
 
-    # Call your existing plotter (preferred because it uses your styling)
-    cmd = [
-        "/home/willy/environmental-monitor/.venv/bin/python",
-        "software/plot_readings.py",
-        date_str,
-    ]
+
+def plot_today_response():
+    date_str = today_str()
 
     try:
-        out = subprocess.check_output(cmd, text=True, stderr=subprocess.STDOUT)
-    except subprocess.CalledProcessError as e:
+        plot_path = plot_readings.plot_day(date_str)
+    except FileNotFoundError as e:
         return JSONResponse(
-            {"ok": False, "error": "Plot generation failed", "details": e.output},
-            status_code=500,
+            {"ok": False, "error": "Today's CSV not found", "path": str(e)},
+            status_code=404,
         )
-
-    plot_path = today_plot_path()
-    if not os.path.exists(plot_path):
+    except Exception as e:
         return JSONResponse(
-            {"ok": False, "error": "Plot script ran but PNG not found", "path": plot_path, "output": out},
+            {"ok": False, "error": "Plot generation failed", "details": str(e)},
             status_code=500,
         )
 
-    return {"ok": True, "date": date_str, "plot": plot_path, "output": out}
+    return {"ok": True, "date": date_str, "plot": plot_path, "output": f"Saved plot to: {plot_path}"}
 
 
 @app.get("/plot/today.png")
-def plot_today_png():
+async def plot_today_png():
     """
     Serve today's plot PNG for <img> embedding.
     """
@@ -125,45 +246,270 @@ def plot_today_png():
 
 
 @app.get("/api/today")
-def api_today(limit: int = Query(5000, ge=1, le=20000)):
+async def api_today(
+    request: Request,
+    limit: int = Query(5000, ge=1, le=20000),
+    since: Optional[str] = None,
+    fmt: Optional[str] = Query(None, alias="format"),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    last: Optional[int] = Query(None, ge=1, le=86400),
+):
+    """
+    Without `since`: the last `limit` rows of today.
+    With `since` (the `next` cursor of a previous response, a byte offset or
+    a timestamp): only rows appended after it, oldest first, up to `limit`.
+    `reset` is true when the cursor no longer applies (new day, file
+    replaced) and the client should drop what it holds.
+
+    `start` / `end` (HH:MM[:SS]) or `last` (seconds) restrict the result to a
+    time window, oldest first; the sidecar index makes this a seek.
+    """
+    return await coalesced(request, today_response, request.headers.get("accept"), limit, since, fmt, start, end, last)
+
+
+def today_window(date_str: str, start: Optional[str], end: Optional[str], last: Optional[int]) -> tuple[Optional[str], Optional[str]]:
+    """(window_start, window_end) timestamps for today's query params."""
+    if start and last:
+        raise ValueError("Use either start or last, not both")
+    window_start = f"{date_str} {readings.parse_clock(start)}" if start else None
+    if last:
+        window_start = (datetime.now() - timedelta(seconds=last)).strftime(TIME_FORMAT)
+    window_end = f"{date_str} {readings.parse_clock(end)}" if end else None
+    return window_start, window_end
+
+
+def today_response(
+    accept: Optional[str],
+    limit: int,
+    since: Optional[str],
+    fmt: Optional[str],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    last: Optional[int] = None,
+):
+    date_str = today_str()
     path = today_csv_path()
-    rows = read_csv_rows(path)
-    return {"ok": True, "csv": path, "count": min(len(rows), limit), "data": rows[-limit:]}
+
+    try:
+        fmt = columns.negotiate(accept, fmt)
+        cursor_date, offset, timestamp = readings.parse_cursor(since) if since is not None else (None, 0, None)
+        window_start, window_end = today_window(date_str, start, end, last)
+    except ValueError as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
+
+    if since is None and window_start is None and window_end is None:
+        if fmt != "json":
+            cols, end_offset = COLUMN_CACHE.tail(path, limit)
+            return columns_response(cols, fmt, readings.make_cursor(date_str, end_offset))
+
+        rows, end_offset = readings.read_rows_from(path)
+        return {
+            "ok": True,
+            "csv": path,
+            "count": min(len(rows), limit),
+            "data": rows[-limit:],
+            "next": readings.make_cursor(date_str, end_offset),
+        }
+
+    reset = False
+    if since is None:
+        offset = readings.offset_at(path, window_start) if window_start else 0
+    elif timestamp is not None:
+        offset = readings.offset_after(path, timestamp)
+    elif cursor_date not in (None, date_str) or not readings.valid_offset(path, offset):
+        offset, reset = 0, True
+
+    if fmt != "json":
+        # Time windows parse only their span; plain delta polls use the cache
+        windowed = window_start is not None or window_end is not None
+        read_from = read_window_columns if windowed else COLUMN_CACHE.read_from
+        cols, end_offset = read_from(path, offset, limit, window_end)
+        return columns_response(cols, fmt, readings.make_cursor(date_str, end_offset), reset, len(cols) >= limit)
+
+    rows, end_offset = readings.read_rows_from(path, offset, limit, until=window_end)
+    return {
+        "ok": True,
+        "csv": path,
+        "count": len(rows),
+        "data": rows,
+        "next": readings.make_cursor(date_str, end_offset),
+        "reset": reset,
+        "more": len(rows) >= limit,
+    }
+
+
+@app.get("/api/range")
+async def api_range(
+    request: Request,
+    start: str,
+    end: str,
+    limit: int = Query(5000, ge=1, le=20000),
+    since: Optional[str] = None,
+    fmt: Optional[str] = Query(None, alias="format"),
+):
+    """
+    Readings from `start` to `end` (YYYY-MM-DD, inclusive), oldest first.
+    Either end may be a timestamp ("YYYY-MM-DD HH:MM[:SS]") to cut a time
+    window; the sidecar index turns that into a seek.
+    Page through (or follow) the range by passing back `next` as `since`.
+    """
+    return await coalesced(request, range_response, request.headers.get("accept"), start, end, limit, since, fmt)
+
+
+def range_response(accept: Optional[str], start: str, end: str, limit: int, since: Optional[str], fmt: Optional[str]):
+    try:
+        fmt = columns.negotiate(accept, fmt)
+        days, window_start, window_end = readings.parse_range(start, end)
+        cursor_date, offset, timestamp = readings.parse_cursor(since) if since else (None, 0, None)
+    except ValueError as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
+
+    # Rows (JSON) or column buffers (binary); both support len() / extend()
+    if fmt == "json":
+        acc: Any = []
+        read_from = readings.read_rows_from
+    else:
+        acc = columns.Columns()
+        windowed = window_start is not None or window_end is not None
+        read_from = read_window_columns if windowed else COLUMN_CACHE.read_from
+
+    first_day = timestamp[:10] if timestamp else (cursor_date or days[0])
+    next_cursor = since or readings.make_cursor(days[0], 0)
+
+    for day in days:
+        if day < first_day:
+            continue
+        path = readings.csv_path_for(day)
+        if not os.path.exists(path):
+            continue
+
+        pos = 0
+        if day == first_day:
+            if timestamp is not None:
+                pos = readings.offset_after(path, timestamp)
+            elif since is None and window_start is not None:
+                pos = readings.offset_at(path, window_start)
+            elif readings.valid_offset(path, offset):
+                pos = offset
+
+        got, pos = read_from(path, pos, limit - len(acc), window_end)
+        acc.extend(got)
+        next_cursor = readings.make_cursor(day, pos)
+        if len(acc) >= limit:
+            break
+
+    if fmt != "json":
+        return columns_response(acc, fmt, next_cursor, more=len(acc) >= limit)
+
+    return {
+        "ok": True,
+        "start": days[0],
+        "end": days[-1],
+        "count": len(acc),
+        "data": acc,
+        "next": next_cursor,
+        "more": len(acc) >= limit,
+    }
 
 
 @app.get("/api/logs")
-def api_logs(lines: int = Query(50, ge=10, le=500)):
-    # Pull last N lines from journalctl for your monitor service
+async def api_logs(request: Request, lines: int = Query(50, ge=10, le=500)):
+    return await coalesced(request, logs_response, lines, ttl=LOGS_CACHE_SECONDS)
+
+
+async def logs_response(lines: int):
+    # Pull last N lines from journalctl for your monitor service. Runs as an
+    # asyncio subprocess: waiting on it holds no executor thread.
     cmd = ["journalctl", "-u", MONITOR_SERVICE, "-n", str(lines), "--no-pager"]
     try:
-        out = subprocess.check_output(cmd, text=True, stderr=subprocess.STDOUT)
-        return {"ok": True, "service": MONITOR_SERVICE, "lines": lines, "text": out}
-    except subprocess.CalledProcessError as e:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+    except OSError as e:
         return JSONResponse(
-            {"ok": False, "error": "Failed to read logs", "details": e.output},
+            {"ok": False, "error": "Failed to read logs", "details": str(e)},
             status_code=500,
         )
 
+    try:
+        out, _ = await asyncio.wait_for(proc.communicate(), JOURNAL_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return JSONResponse(
+            {"ok": False, "error": f"journalctl timed out after {JOURNAL_TIMEOUT_SECONDS}s"},
+            status_code=504,
+        )
+
+    text = out.decode(errors="replace")
+    if proc.returncode != 0:
+        return JSONResponse(
+            {"ok": False, "error": "Failed to read logs", "details": text},
+            status_code=500,
+        )
+    return {"ok": True, "service": MONITOR_SERVICE, "lines": lines, "text": text}
+
 
 @app.get("/download/csv")
-def download_csv():
+async def download_csv(request: Request):
     path = today_csv_path()
     if not os.path.exists(path):
         return JSONResponse({"ok": False, "error": "Today's CSV not found", "path": path}, status_code=404)
-    return FileResponse(path, media_type="text/csv", filename=os.path.basename(path))
+    return file_download(request, path, "text/csv")
+
+
+@app.get("/download/csv/{date_str}")
+async def download_csv_for(request: Request, date_str: str):
+    try:
+        date_str = readings.parse_date(date_str)
+    except ValueError:
+        return JSONResponse({"ok": False, "error": "Use /download/csv/YYYY-MM-DD"}, status_code=400)
+
+    path = readings.csv_path_for(date_str)
+    if not os.path.exists(path):
+        return JSONResponse({"ok": False, "error": "CSV not found", "path": path}, status_code=404)
+    return file_download(request, path, "text/csv")
+
+
+@app.get("/download/export")
+async def download_export(start: str, end: str, fmt: str = Query("csv", alias="format")):
+    """
+    Stream readings from `start` to `end` (dates or timestamps) as one file.
+    Bytes start flowing immediately; memory stays bounded for long ranges.
+    """
+    try:
+        days, window_start, window_end = readings.parse_range(start, end)
+    except ValueError as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
+
+    formats = export.available_formats()
+    if fmt not in formats:
+        return JSONResponse(
+            {"ok": False, "error": f"Unsupported format: {fmt!r}", "formats": formats},
+            status_code=400,
+        )
+
+    media_type, ext = export.EXPORT_FORMATS[fmt]
+    filename = f"readings_{days[0]}_{days[-1]}{ext}"
+    return StreamingResponse(
+        export.export_chunks(fmt, days, window_start, window_end),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @app.get("/download/plot")
-def download_plot():
+async def download_plot(request: Request):
     path = today_plot_path()
     if not os.path.exists(path):
         return JSONResponse({"ok": False, "error": "Today's plot not found", "path": path}, status_code=404)
-    return FileResponse(path, media_type="image/png", filename=os.path.basename(path))
+    return file_download(request, path, "image/png")
 
 
 @app.get("/", response_class=HTMLResponse)
 @app.get("/", response_class=HTMLResponse)
-def dashboard():
+async def dashboard():
     return """
 <!doctype html>
 <html>
@@ -179,22 +525,24 @@ def dashboard():
     pre { background: #111; color: #eee; padding: 12px; border-radius: 10px; overflow: auto; max-height: 420px; }
     a { text-decoration: none; }
     button { padding: 10px 12px; border-radius: 10px; border: 1px solid #ccc; cursor: pointer; }
-    img { display: block; margin-top: 12px; max-width: 100%; border: 1px solid #ddd; border-radius: 10px; }
+    canvas { display: block; margin-top: 12px; width: 100%; height: 260px; border: 1px solid #ddd; border-radius: 10px; }
   </style>
 </head>
 <body>
   <h1>Environmental Monitor</h1>
-  <p class="muted">Live readings + system logs + on-demand plots.</p>
+  <p class="muted">Live readings + chart + system logs + on-demand plots.</p>
 
   <div class="row">
-    <div class="card">
+    <div class="card" style="min-width: 420px;">
       <div class="muted">Latest reading</div>
       <div id="latest" class="big">Loading...</div>
       <div id="latest_meta" class="muted"></div>
+      <canvas id="chart" aria-label="Today's temperature (red) and humidity (blue)"></canvas>
 
       <p style="margin-top: 12px;">
         <a href="/download/csv">Download today’s CSV</a><br/>
-        <a href="/download/plot">Download today’s plot</a>
+        <a href="/download/plot">Download today’s plot</a><br/>
+        <a id="export30" href="#">Export last 30 days (CSV.gz)</a>
       </p>
 
       <hr style="border: none; border-top: 1px solid #eee; margin: 14px 0;" />
@@ -204,7 +552,6 @@ def dashboard():
         <button id="btnPlot">Generate Today’s Plot</button>
         <span id="plotStatus" class="muted" style="margin-left: 10px;"></span>
       </p>
-      <img id="plotImg" src="/plot/today.png" alt="Today's plot (generate to update)" />
     </div>
 
     <div class="card" style="flex: 1; min-width: 360px;">
@@ -214,26 +561,151 @@ def dashboard():
   </div>
 
 <script>
-async function refreshLatest() {
+// Local copy of today's readings as typed columns, fed only by binary
+// /api/today deltas (see web/columns.py for the payload layout)
+const COLUMNS = "application/x-envmon-columns";
+const series = {
+  cursor: null, busy: false, n: 0, base: 0, lastEpoch: 0,
+  t: new Float32Array(512),      // seconds since the first reading
+  temp: new Float32Array(512),
+  hum: new Float32Array(512),
+  light: new Uint8Array(512),
+};
+
+function reserve(extra) {
+  const need = series.n + extra;
+  if (need <= series.t.length) return;
+  let cap = series.t.length;
+  while (cap < need) cap *= 2;
+  for (const k of ["t", "temp", "hum", "light"]) {
+    const next = new series[k].constructor(cap);
+    next.set(series[k].subarray(0, series.n));
+    series[k] = next;
+  }
+}
+
+function appendColumns(buf) {
+  const view = new DataView(buf);
+  if (view.getUint32(0, false) !== 0x454e5643) throw new Error("Unexpected payload");  // "ENVC"
+  const n = view.getUint32(8, true);
+  if (!n) return;
+
+  const epoch = new Uint32Array(buf, 16, n);
+  if (!series.n) series.base = epoch[0];
+  reserve(n);
+  for (let i = 0; i < n; i++) series.t[series.n + i] = epoch[i] - series.base;
+  series.temp.set(new Float32Array(buf, 16 + 4 * n, n), series.n);
+  series.hum.set(new Float32Array(buf, 16 + 8 * n, n), series.n);
+  series.light.set(new Uint8Array(buf, 16 + 12 * n, n), series.n);
+  series.lastEpoch = epoch[n - 1];
+  series.n += n;
+}
+
+function fmtTime(epoch) {
+  const d = new Date(epoch * 1000);
+  const p = (v) => String(v).padStart(2, "0");
+  return `${d.getFullYear()}-${p(d.getMonth() + 1)}-${p(d.getDate())} ${p(d.getHours())}:${p(d.getMinutes())}:${p(d.getSeconds())}`;
+}
+
+function drawChart() {
+  const canvas = document.getElementById("chart");
+  const dpr = window.devicePixelRatio || 1;
+  const w = canvas.clientWidth, h = canvas.clientHeight;
+  canvas.width = w * dpr;
+  canvas.height = h * dpr;
+  const ctx = canvas.getContext("2d");
+  ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+  ctx.clearRect(0, 0, w, h);
+
+  const n = series.n;
+  if (n < 2) return;
+
+  const pad = 30;
+  const t0 = series.t[0], span = Math.max(series.t[n - 1] - t0, 1);
+  const x = (t) => pad + (t - t0) / span * (w - 2 * pad);
+
+  // Temperature (left) red, humidity (right) blue, each on its own scale
+  function plot(values, color, unit, left) {
+    let lo = Infinity, hi = -Infinity;
+    for (let i = 0; i < n; i++) {
+      const v = values[i];
+      if (v < lo) lo = v;
+      if (v > hi) hi = v;
+    }
+    if (!isFinite(lo)) return;
+    if (hi - lo < 1) { lo -= 0.5; hi += 0.5; }
+    const y = (v) => h - pad - (v - lo) / (hi - lo) * (h - 2 * pad);
+
+    ctx.strokeStyle = color;
+    ctx.lineWidth = 2;
+    ctx.beginPath();
+    let pen = false;
+    for (let i = 0; i < n; i++) {
+      const v = values[i];
+      if (Number.isNaN(v)) { pen = false; continue; }
+      if (pen) ctx.lineTo(x(series.t[i]), y(v));
+      else { ctx.moveTo(x(series.t[i]), y(v)); pen = true; }
+    }
+    ctx.stroke();
+
+    ctx.fillStyle = color;
+    ctx.textAlign = left ? "left" : "right";
+    ctx.fillText(hi.toFixed(0) + unit, left ? 2 : w - 2, pad - 8);
+    ctx.fillText(lo.toFixed(0) + unit, left ? 2 : w - 2, h - pad + 14);
+  }
+
+  ctx.font = "11px sans-serif";
+  plot(series.temp, "red", "°F", true);
+  plot(series.hum, "blue", "%", false);
+
+  ctx.fillStyle = "#666";
+  ctx.textAlign = "center";
+  ctx.fillText(fmtTime(series.base + t0).slice(11), pad + 24, h - 4);
+  ctx.fillText(fmtTime(series.lastEpoch).slice(11), w - pad - 24, h - 4);
+}
+
+async function refreshData() {
   const el = document.getElementById("latest");
   const meta = document.getElementById("latest_meta");
 
+  if (series.busy) return;  // never apply the same delta twice
+  series.busy = true;
+
   try {
-    const r = await fetch("/api/latest");
-    const j = await r.json();
+    let more = true;
+    while (more) {
+      const url = series.cursor
+        ? "/api/today?since=" + encodeURIComponent(series.cursor)
+        : "/api/today";
+      const r = await fetch(url, { headers: { Accept: COLUMNS } });
+      if (!r.ok) {
+        const j = await r.json();
+        throw new Error(j.error || r.statusText);
+      }
+
+      if (!series.cursor || r.headers.get("X-Reset") === "1") series.n = 0;
+      appendColumns(await r.arrayBuffer());
+      series.cursor = r.headers.get("X-Next-Cursor");
+      more = r.headers.get("X-More") === "1";
+    }
 
-    if (!j.ok) {
+    drawChart();
+
+    if (!series.n) {
       el.textContent = "No data yet";
-      meta.textContent = j.error || "";
+      meta.textContent = "";
       return;
     }
 
-    const d = j.data;
-    el.textContent = `${d.temp_f} °F | ${d.humidity}% | ${d.light}`;
-    meta.textContent = `Timestamp: ${d.timestamp}`;
+    const i = series.n - 1;
+    const light = { 0: "DARK", 1: "LIGHT" }[series.light[i]] || "?";
+    el.textContent = `${series.temp[i].toFixed(1)} °F | ${series.hum[i].toFixed(0)}% | ${light}`;
+    meta.textContent = `Timestamp: ${fmtTime(series.lastEpoch)} · ${series.n} readings today`;
   } catch (e) {
     el.textContent = "Error fetching latest";
     meta.textContent = String(e);
+  } finally {
+    series.busy = false;
   }
 }
 
@@ -250,7 +722,6 @@ async function refreshLogs() {
 
 async function generatePlot() {
   const status = document.getElementById("plotStatus");
-  const img = document.getElementById("plotImg");
 
   status.textContent = "Generating...";
 
@@ -263,8 +734,7 @@ async function generatePlot() {
       return;
     }
 
-    status.textContent = "Updated.";
-    img.src = "/plot/today.png?v=" + Date.now(); // cache-bust
+    status.innerHTML = `Updated. <a href="/plot/today.png?v=${Date.now()}" target="_blank">Open PNG</a>`; // cache-bust
   } catch (e) {
     status.textContent = "Error: " + String(e);
   }
@@ -272,9 +742,19 @@ async function generatePlot() {
 
 document.getElementById("btnPlot").addEventListener("click", generatePlot);
 
-refreshLatest();
+window.addEventListener("resize", drawChart);
+
+(function setExportLink() {
+  const day = (d) => fmtTime(d.getTime() / 1000).slice(0, 10);
+  const end = new Date();
+  const start = new Date(end.getTime() - 29 * 86400 * 1000);
+  document.getElementById("export30").href =
+    `/download/export?start=${day(start)}&end=${day(end)}&format=csv.gz`;
+})();
+
+refreshData();
 refreshLogs();
-setInterval(refreshLatest, 5000);
+setInterval(refreshData, 5000);
 setInterval(refreshLogs, 15000);
 </script>
 </body>
@@ -0,0 +1,52 @@
+"""
+Single-flight request coalescing with a short TTL cache
+
+When twenty dashboard tabs poll the same endpoint at once, only the first
+request does the work; the others await the same task and share its
+result. Finished results are kept for `ttl` seconds so a burst arriving
+just after the work completes is served from memory as well.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class SingleFlight:
+    def __init__(self, ttl: float = 1.0, max_entries: int = 512) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._inflight: dict[Hashable, "asyncio.Task[Any]"] = {}
+        self._cache: dict[Hashable, tuple[float, Any]] = {}
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        """Return the cached/in-flight result for `key`, or run `work()` once."""
+        ttl = self.ttl if ttl is None else ttl
+
+        hit = self._cache.get(key)
+        if hit is not None:
+            if hit[0] > time.monotonic():
+                return hit[1]
+            del self._cache[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t, ttl))
+
+        # shield: a client disconnecting must not cancel everyone else's result
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]", ttl: float) -> None:
+        self._inflight.pop(key, None)
+        if ttl <= 0 or task.cancelled() or task.exception() is not None:
+            return
+
+        if len(self._cache) >= self.max_entries:
+            now = time.monotonic()
+            for stale in [k for k, (expires, _) in self._cache.items() if expires <= now]:
+                del self._cache[stale]
+            if len(self._cache) >= self.max_entries:
+                self._cache.clear()
+        self._cache[key] = (time.monotonic() + ttl, task.result())
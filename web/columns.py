@@ -0,0 +1,307 @@
+"""
+Columnar (binary) encoding of the daily readings
+
+Each daily CSV is parsed once into typed column buffers (array.array) and
+kept in a small LRU cache; later requests only parse rows appended since
+the last visit. Time-window reads skip the cache and parse just the byte
+span the window covers (read_window()). Responses are serialised straight
+from those buffers, so building a payload never creates per-row Python
+objects.
+
+Packed format ("application/x-envmon-columns", little-endian):
+
+    offset      size  field
+    0           4     magic b"ENVC"
+    4           2     version (1)
+    6           2     column count (4)
+    8           4     row count n
+    12          4     reserved (0)
+    16          4n    epoch     uint32  (unix seconds)
+    16 + 4n     4n    temp_f    float32 (NaN if missing)
+    16 + 8n     4n    humidity  float32 (NaN if missing)
+    16 + 12n    n     light     uint8   (1 = LIGHT, 0 = DARK, 255 = unknown)
+
+Every column starts on a 4-byte boundary, so browsers can view it with
+Uint32Array / Float32Array / Uint8Array without copying.
+
+Arrow IPC stream ("application/vnd.apache.arrow.stream") with the same
+columns is offered when pyarrow is installed.
+"""
+
+import csv
+import importlib.util
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Optional
+
+MEDIA_COLUMNS = "application/x-envmon-columns"
+MEDIA_ARROW = "application/vnd.apache.arrow.stream"
+
+MAGIC = b"ENVC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+
+LIGHT_CODES = {"LIGHT": 1, "DARK": 0}
+LIGHT_UNKNOWN = 255
+NAN = float("nan")
+
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+
+class Columns:
+    """Typed column buffers for a run of readings."""
+
+    def __init__(self) -> None:
+        self.epoch = array("I")
+        self.temp_f = array("f")
+        self.humidity = array("f")
+        self.light = array("B")
+        # Byte offset where each row starts in its CSV (cursor lookups)
+        self.starts = array("Q")
+
+    def __len__(self) -> int:
+        return len(self.epoch)
+
+    def slice(self, i: int, j: int) -> "Columns":
+        out = Columns()
+        out.epoch = self.epoch[i:j]
+        out.temp_f = self.temp_f[i:j]
+        out.humidity = self.humidity[i:j]
+        out.light = self.light[i:j]
+        out.starts = self.starts[i:j]
+        return out
+
+    def extend(self, other: "Columns") -> None:
+        self.epoch.extend(other.epoch)
+        self.temp_f.extend(other.temp_f)
+        self.humidity.extend(other.humidity)
+        self.light.extend(other.light)
+        self.starts.extend(other.starts)
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return NAN
+
+
+def _epoch(ts: str) -> int:
+    # "YYYY-MM-DD HH:MM:SS" in local time, same as the logger writes it
+    return int(time.mktime((int(ts[0:4]), int(ts[5:7]), int(ts[8:10]), int(ts[11:13]), int(ts[14:16]), int(ts[17:19]), 0, 0, -1)))
+
+
+def epoch_for(timestamp: str) -> int:
+    """Unix seconds for a TIME_FORMAT timestamp string."""
+    return _epoch(timestamp)
+
+
+def _append_lines(cols: Columns, lines: list[str], starts: list[int]) -> None:
+    for start, values in zip(starts, csv.reader(lines)):
+        if len(values) < 4 or not values[0]:
+            continue
+        try:
+            epoch = _epoch(values[0])
+        except (ValueError, OverflowError):
+            continue
+        cols.epoch.append(epoch)
+        cols.temp_f.append(_to_float(values[1]))
+        cols.humidity.append(_to_float(values[2]))
+        cols.light.append(LIGHT_CODES.get(values[3], LIGHT_UNKNOWN))
+        cols.starts.append(start)
+
+
+def read_window(path: str, start: int, stop: int, limit: Optional[int] = None) -> tuple[Columns, int]:
+    """
+    Uncached read_from(): parse the complete rows in bytes [start, stop) of
+    `path`, at most `limit` of them. Returns (columns, next offset). Costs
+    what the span holds, whatever the size of the file.
+    """
+    cols = Columns()
+    lines: list[str] = []
+    starts: list[int] = []
+    if not os.path.exists(path):
+        return cols, start
+
+    with open(path, "rb") as f:
+        if start == 0:
+            start = len(f.readline())
+        f.seek(start)
+        pos = start
+        for raw in f:
+            if pos + len(raw) > stop or not raw.endswith(b"\n"):
+                break
+            if limit is not None and len(lines) >= limit:
+                break
+            starts.append(pos)
+            lines.append(raw.decode())
+            pos += len(raw)
+    _append_lines(cols, lines, starts)
+    return cols, pos
+
+
+def read_span(path: str, start: int, stop: int) -> Columns:
+    """Parse the complete rows in bytes [start, stop) of `path` (uncached)."""
+    return read_window(path, start, stop)[0]
+
+
+class _Entry:
+    def __init__(self, ident: tuple[int, int]) -> None:
+        self.ident = ident
+        self.cols = Columns()
+        self.parsed_upto = 0
+
+
+class ColumnCache:
+    """
+    LRU cache of parsed daily files, refreshed incrementally.
+
+    A file is re-parsed from scratch only if it was replaced or truncated;
+    otherwise just the complete lines appended since the last call are read.
+    """
+
+    def __init__(self, max_files: int = 64) -> None:
+        self.max_files = max_files
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, path: str) -> tuple[Columns, int, int]:
+        """
+        Return (columns, n, end) for `path`: the shared column buffers, the
+        number of rows and the end offset of the last complete row, taken
+        together under the lock. Other threads may append to the buffers
+        afterwards, so callers must only look at the first n rows.
+        """
+        with self._lock:
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._entries.pop(path, None)
+                return Columns(), 0, 0
+
+            ident = (st.st_dev, st.st_ino)
+            entry = self._entries.get(path)
+            if entry is None or entry.ident != ident or st.st_size < entry.parsed_upto:
+                entry = _Entry(ident)
+                self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_files:
+                self._entries.popitem(last=False)
+
+            if st.st_size > entry.parsed_upto:
+                self._refresh(path, entry)
+            return entry.cols, len(entry.cols), entry.parsed_upto
+
+    def _refresh(self, path: str, entry: _Entry) -> None:
+        with open(path, "rb") as f:
+            pos = entry.parsed_upto
+            if pos == 0:
+                header = f.readline()
+                if not header.endswith(b"\n"):
+                    return
+                pos = len(header)
+            f.seek(pos)
+
+            lines: list[str] = []
+            starts: list[int] = []
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # partial row still being written
+                starts.append(pos)
+                lines.append(raw.decode())
+                pos += len(raw)
+
+        _append_lines(entry.cols, lines, starts)
+        entry.parsed_upto = pos
+
+    def read_from(
+        self,
+        path: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        until: Optional[str] = None,
+    ) -> tuple[Columns, int]:
+        """Columnar equivalent of readings.read_rows_from()."""
+        cols, n, end = self.load(path)
+        i = bisect_left(cols.starts, offset, 0, n)
+        j = n if limit is None else min(n, i + limit)
+        if until is not None:
+            j = max(i, min(j, bisect_right(cols.epoch, epoch_for(until), 0, n)))
+        next_offset = cols.starts[j] if j < n else max(end, offset)
+        return cols.slice(i, j), next_offset
+
+    def tail(self, path: str, limit: int) -> tuple[Columns, int]:
+        """The last `limit` rows of `path` and the end cursor offset."""
+        cols, n, end = self.load(path)
+        return cols.slice(max(0, n - limit), n), end
+
+
+def le_bytes(buf: array) -> bytes:
+    if sys.byteorder == "big":
+        buf = array(buf.typecode, buf)
+        buf.byteswap()
+    return buf.tobytes()
+
+
+def encode_packed(cols: Columns) -> bytes:
+    """Serialise to the packed ENVC layout described above."""
+    return b"".join(
+        (
+            HEADER.pack(MAGIC, VERSION, 4, len(cols), 0),
+            le_bytes(cols.epoch),
+            le_bytes(cols.temp_f),
+            le_bytes(cols.humidity),
+            cols.light.tobytes(),
+        )
+    )
+
+
+def encode_arrow(cols: Columns) -> bytes:
+    """Serialise to an Arrow IPC stream (requires pyarrow)."""
+    import pyarrow as pa
+
+    n = len(cols)
+
+    def column(kind, buf: array):
+        return pa.Array.from_buffers(kind, n, [None, pa.py_buffer(le_bytes(buf))])
+
+    batch = pa.record_batch(
+        [
+            column(pa.uint32(), cols.epoch),
+            column(pa.float32(), cols.temp_f),
+            column(pa.float32(), cols.humidity),
+            column(pa.uint8(), cols.light),
+        ],
+        names=["epoch", "temp_f", "humidity", "light"],
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def negotiate(accept: Optional[str], fmt: Optional[str] = None) -> str:
+    """
+    Pick "json", "columns" or "arrow" from a `format` override or the
+    Accept header. Arrow is only chosen when pyarrow is installed.
+    """
+    if fmt:
+        fmt = fmt.lower()
+        if fmt == "arrow" and not ARROW_AVAILABLE:
+            raise ValueError("Arrow format needs pyarrow installed")
+        if fmt not in ("json", "columns", "arrow"):
+            raise ValueError(f"Unknown format: {fmt!r}")
+        return fmt
+
+    accept = (accept or "").lower()
+    if ARROW_AVAILABLE and MEDIA_ARROW in accept:
+        return "arrow"
+    if MEDIA_COLUMNS in accept:
+        return "columns"
+    return "json"
@@ -0,0 +1,175 @@
+"""
+Bulk export over a range of days
+
+export_chunks() produces one combined CSV / CSV.gz / Parquet stream over
+many days, generated chunk by chunk. Memory stays bounded by CHUNK_BYTES
+(one day of columns for Parquet) however long the range is, and the first
+bytes go out before later days have been read.
+"""
+
+import os
+import zlib
+from typing import Iterator, Optional
+
+from web import columns, readings
+
+CHUNK_BYTES = 64 * 1024
+CSV_HEADER = b"timestamp,temp_f,humidity,light\r\n"
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "csv.gz": ("application/gzip", ".csv.gz"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+
+def available_formats() -> list[str]:
+    """Export formats this install can produce (Parquet needs pyarrow)."""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or columns.ARROW_AVAILABLE]
+
+
+def iter_file(path: str, start: int, stop: int) -> Iterator[bytes]:
+    """Yield bytes [start, stop) of `path` in CHUNK_BYTES pieces."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _complete_rows_end(path: str) -> int:
+    """Offset just past the last complete row (ignores a row mid-write)."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        back = 256
+        while True:
+            f.seek(max(0, size - back))
+            tail = f.read()
+            cut = tail.rfind(b"\n")
+            if cut >= 0:
+                return size - len(tail) + cut + 1
+            if back >= size:
+                return 0
+            back *= 4
+
+
+def _day_spans(days: list[str], window_start: Optional[str], window_end: Optional[str]) -> Iterator[tuple[str, int, int]]:
+    """(path, start, stop) byte spans of data rows for each existing day."""
+    for day in days:
+        path = readings.csv_path_for(day)
+        if not os.path.exists(path):
+            continue
+
+        with open(path, "rb") as f:
+            header_len = len(f.readline())
+        start = header_len
+        stop = _complete_rows_end(path)
+        if window_start and day == days[0]:
+            start = readings.offset_at(path, window_start)
+        if window_end and day == days[-1]:
+            stop = min(stop, readings.offset_after(path, window_end))
+        if stop > start:
+            yield path, start, stop
+
+
+def _csv_chunks(days: list[str], window_start: Optional[str], window_end: Optional[str]) -> Iterator[bytes]:
+    yield CSV_HEADER
+    for path, start, stop in _day_spans(days, window_start, window_end):
+        yield from iter_file(path, start, stop)
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        out = gz.compress(chunk)
+        if out:
+            yield out
+    yield gz.flush()
+
+
+class _ChunkSink:
+    """Write-only file object that Parquet writes into and we drain."""
+
+    def __init__(self) -> None:
+        self.pending: list[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.pending.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self.pending)
+        self.pending = []
+        return out
+
+
+def _parquet_chunks(days: list[str], window_start: Optional[str], window_end: Optional[str]) -> Iterator[bytes]:
+    """One Parquet row group per day, streamed as each group is written."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("timestamp", pa.timestamp("s", tz="UTC")),
+            ("temp_f", pa.float32()),
+            ("humidity", pa.float32()),
+            ("light", pa.dictionary(pa.uint8(), pa.string())),
+        ]
+    )
+    light_values = pa.array(["DARK", "LIGHT"])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for path, start, stop in _day_spans(days, window_start, window_end):
+            cols = columns.read_span(path, start, stop)
+            n = len(cols)
+            if not n:
+                continue
+
+            def column(kind, buf):
+                return pa.Array.from_buffers(kind, n, [None, pa.py_buffer(columns.le_bytes(buf))])
+
+            codes = column(pa.uint8(), cols.light)
+            codes = pc.if_else(pc.equal(codes, columns.LIGHT_UNKNOWN), pa.scalar(None, pa.uint8()), codes)
+            table = pa.table(
+                [
+                    column(pa.uint32(), cols.epoch).cast(pa.int64()).cast(pa.timestamp("s", tz="UTC")),
+                    column(pa.float32(), cols.temp_f),
+                    column(pa.float32(), cols.humidity),
+                    pa.DictionaryArray.from_arrays(codes, light_values),
+                ],
+                schema=schema,
+            )
+            writer.write_table(table)
+            out = sink.drain()
+            if out:
+                yield out
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_chunks(fmt: str, days: list[str], window_start: Optional[str], window_end: Optional[str]) -> Iterator[bytes]:
+    if fmt == "parquet":
+        return _parquet_chunks(days, window_start, window_end)
+    chunks = _csv_chunks(days, window_start, window_end)
+    return _gzip_chunks(chunks) if fmt == "csv.gz" else chunks
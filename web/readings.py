@@ -0,0 +1,199 @@
+"""
+Incremental reads of the daily CSV files
+
+The logger only ever appends to data/readings_YYYY-MM-DD.csv, so a byte
+offset is a stable cursor: clients send back the `next` cursor they were
+given and we seek straight to it instead of re-parsing the whole day.
+
+Cursor forms accepted by parse_cursor():
+- "YYYY-MM-DD:<offset>"   day-qualified byte offset (what we hand out)
+- "<offset>"              byte offset into the endpoint's (first) day
+- "YYYY-MM-DD HH:MM[:SS]" timestamp; rows strictly after it
+  (a "T" separator is accepted too)
+
+Timestamp lookups go through the sparse sidecar index
+(software/csv_index.py): a binary search gives a nearby byte offset and
+only the rows between it and the target are scanned, so time-window reads
+cost what the window holds rather than the size of the day.
+"""
+
+import csv
+import os
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from software import csv_index
+
+DATA_DIR = "data"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+MAX_RANGE_DAYS = 366
+
+_DAY_OFFSET_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}):(\d+)$")
+_TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M")
+_CLOCK_FORMATS = ("%H:%M:%S", "%H:%M")
+
+
+def csv_path_for(date_str: str) -> str:
+    return os.path.join(DATA_DIR, f"readings_{date_str}.csv")
+
+
+def parse_date(value: str) -> str:
+    """Validate a YYYY-MM-DD string (raises ValueError)."""
+    return datetime.strptime(value, DATE_FORMAT).strftime(DATE_FORMAT)
+
+
+def parse_timestamp(value: str) -> str:
+    """Normalise a timestamp to the CSV's TIME_FORMAT (raises ValueError)."""
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime(TIME_FORMAT)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid timestamp: {value!r}")
+
+
+def parse_clock(value: str) -> str:
+    """Normalise "HH:MM[:SS]" to "HH:MM:SS" (raises ValueError)."""
+    for fmt in _CLOCK_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%H:%M:%S")
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid time of day: {value!r}")
+
+
+def parse_cursor(since: str) -> tuple[Optional[str], Optional[int], Optional[str]]:
+    """
+    Split a `since` cursor into (date, offset, timestamp).
+
+    Exactly one of offset / timestamp is set; date may be None for a bare
+    offset. Raises ValueError for anything else.
+    """
+    since = since.strip()
+    if since.isdigit():
+        return None, int(since), None
+
+    match = _DAY_OFFSET_RE.match(since)
+    if match:
+        return parse_date(match.group(1)), int(match.group(2)), None
+
+    return None, None, parse_timestamp(since)
+
+
+def make_cursor(date_str: str, offset: int) -> str:
+    return f"{date_str}:{offset}"
+
+
+def day_range(start: str, end: str) -> list[str]:
+    """Inclusive list of YYYY-MM-DD strings (raises ValueError if invalid/too long)."""
+    first = date.fromisoformat(parse_date(start))
+    last = date.fromisoformat(parse_date(end))
+    if last < first:
+        raise ValueError("end is before start")
+    days = (last - first).days + 1
+    if days > MAX_RANGE_DAYS:
+        raise ValueError(f"Range too long (max {MAX_RANGE_DAYS} days)")
+    return [(first + timedelta(days=i)).strftime(DATE_FORMAT) for i in range(days)]
+
+
+def parse_range(start: str, end: str) -> tuple[list[str], Optional[str], Optional[str]]:
+    """
+    `start` / `end` are dates (whole days) or timestamps (time window).
+    Returns (days, window_start, window_end); window bounds are None for
+    whole-day ends. Raises ValueError.
+    """
+    window_start = parse_timestamp(start) if len(start) > 10 else None
+    window_end = parse_timestamp(end) if len(end) > 10 else None
+    days = day_range((window_start or start)[:10], (window_end or end)[:10])
+    return days, window_start, window_end
+
+
+def _header(f) -> tuple[list[str], int]:
+    line = f.readline()
+    fields = line.decode().strip().split(",") if line.endswith(b"\n") else []
+    return fields, len(line)
+
+
+def valid_offset(path: str, offset: int) -> bool:
+    """True if `offset` is a row boundary within the file's current size."""
+    if offset == 0:
+        return True
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return False
+    if offset > size:
+        return False
+    with open(path, "rb") as f:
+        f.seek(offset - 1)
+        return f.read(1) == b"\n"
+
+
+def read_rows_from(
+    path: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    until: Optional[str] = None,
+) -> tuple[list[dict[str, str]], int]:
+    """
+    Parse rows starting at byte `offset`; return (rows, next_offset).
+
+    Only complete lines are consumed, so a row the logger is still writing
+    is picked up by the next call. With `limit`, stops after that many rows
+    and next_offset points just past the last one returned. With `until`
+    (a timestamp), stops before the first row later than it.
+    """
+    if not os.path.exists(path):
+        return [], offset
+
+    with open(path, "rb") as f:
+        fields, header_len = _header(f)
+        if not fields:
+            return [], offset
+        pos = max(offset, header_len)
+        f.seek(pos)
+
+        stop = until.encode() if until else None
+        lines: list[str] = []
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # partial row still being written
+            if limit is not None and len(lines) >= limit:
+                break
+            if stop is not None and raw[: len(stop)] > stop:
+                break
+            pos += len(raw)
+            lines.append(raw.decode())
+
+    rows = [dict(zip(fields, values)) for values in csv.reader(lines) if values and values[0]]
+    return rows, pos
+
+
+def _scan_to(path: str, timestamp: str, strict: bool) -> int:
+    if not os.path.exists(path):
+        return 0
+
+    key = timestamp.encode()
+    with open(path, "rb") as f:
+        _, header_len = _header(f)
+        pos = max(csv_index.seek(path, timestamp, strict), header_len)
+        f.seek(pos)
+        for raw in f:
+            # Rows are appended in time order and start with the timestamp
+            stamp = raw[: len(key)]
+            if not raw.endswith(b"\n") or stamp > key or (stamp == key and not strict):
+                break
+            pos += len(raw)
+    return pos
+
+
+def offset_after(path: str, timestamp: str) -> int:
+    """Byte offset of the first row whose timestamp is later than `timestamp`."""
+    return _scan_to(path, timestamp, strict=True)
+
+
+def offset_at(path: str, timestamp: str) -> int:
+    """Byte offset of the first row at or after `timestamp`."""
+    return _scan_to(path, timestamp, strict=False)